@@ -4,10 +4,12 @@ Central application controller that manages all components.
 """
 
 import sys
+import queue
 import logging
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
 from PySide6.QtGui import QFont
 
 from core.plugin_manager import PluginManager
@@ -17,6 +19,8 @@ from ui.main_window import MainWindow
 from ui.control_panel import ControlPanel
 from ui.icon_widget import FloatingIcon, SystemTrayManager
 
+_LOG_DIR = Path(__file__).resolve().parent.parent / "logs"
+
 
 class GamingHelperApp(QObject):
     """Main application class that coordinates all components."""
@@ -32,9 +36,9 @@ class GamingHelperApp(QObject):
         self.plugin_manager = None
         self.thread_manager = None
         
-        # UI components
-        self.main_window = None
-        self.control_panel = None
+        # UI components (main window and control panel are created on demand)
+        self._main_window = None
+        self._control_panel = None
         self.floating_icon = None
         self.tray_manager = None
         
@@ -42,22 +46,74 @@ class GamingHelperApp(QObject):
         self.is_initialized = False
         self.is_shutting_down = False
         
+        # Background thread that writes queued log records, and the handlers
+        # this instance installed (closed explicitly on shutdown)
+        self._log_listener = None
+        self._log_buffer = None
+        self._log_handlers = ()
+        
         # Setup logging
         self._setup_logging()
+    
+    @property
+    def main_window(self) -> MainWindow:
+        """Main window, created on first access."""
+        if self._main_window is None:
+            self.logger.info("[WINDOW] Creating Main Window...")
+            self._main_window = MainWindow(
+                config_manager=self.config_manager,
+                plugin_manager=self.plugin_manager
+            )
+        return self._main_window
+    
+    @property
+    def control_panel(self) -> ControlPanel:
+        """Control panel, created on first access."""
+        if self._control_panel is None:
+            self.logger.info("[PANEL] Creating Control Panel...")
+            self._control_panel = ControlPanel(
+                config_manager=self.config_manager,
+                plugin_manager=self.plugin_manager,
+                thread_manager=self.thread_manager
+            )
+            self._control_panel.close_requested.connect(self._control_panel.hide)
+        return self._control_panel
         
     def _setup_logging(self):
         """Configure application logging."""
-        log_dir = Path(__file__).parent.parent / "logs"
-        log_dir.mkdir(exist_ok=True)
-        
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_dir / "gaming_helper.log", encoding='utf-8'),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+        _LOG_DIR.mkdir(exist_ok=True)
+        
+        root_logger = logging.getLogger()
+        if not root_logger.handlers:
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            file_handler = RotatingFileHandler(
+                _LOG_DIR / "gaming_helper.log",
+                maxBytes=5_000_000,
+                backupCount=3,
+                encoding='utf-8',
+                delay=True
+            )
+            stream_handler = logging.StreamHandler(sys.stdout)
+            for handler in (file_handler, stream_handler):
+                handler.setFormatter(formatter)
+            
+            # Batch file writes; warnings and errors are written through
+            # immediately, so a crash loses at most a few INFO records
+            self._log_buffer = MemoryHandler(
+                capacity=50,
+                flushLevel=logging.WARNING,
+                target=file_handler
+            )
+            
+            # Log calls only enqueue records; the listener thread does the I/O
+            log_queue = queue.Queue(-1)
+            self._log_listener = QueueListener(log_queue, self._log_buffer, stream_handler)
+            self._log_listener.start()
+            
+            queue_handler = QueueHandler(log_queue)
+            root_logger.setLevel(logging.INFO)
+            root_logger.addHandler(queue_handler)
+            self._log_handlers = (queue_handler, self._log_buffer, file_handler, stream_handler)
         
         self.logger = logging.getLogger("GamingHelperApp")
         self.logger.info("[ROCKET] Gaming Helper Overlay starting...")
@@ -79,19 +135,19 @@ class GamingHelperApp(QObject):
             self.logger.info("[CONNECT] Connecting component signals...")
             self._connect_signals()
             
-            # Load and activate plugins
-            self.logger.info("[PLUGINS] Loading plugins...")
-            self._load_plugins()
-            
             # Show floating icon
             self.floating_icon.show()
             self.logger.info("[DISPLAY] Floating icon displayed")
             
+            # Discover plugins once the event loop has painted the icon
+            self.logger.info("[PLUGINS] Scheduling plugin discovery...")
+            QTimer.singleShot(0, self._load_plugins)
+            
             self.is_initialized = True
             self.logger.info("[SUCCESS] Gaming Helper Overlay initialized successfully!")
             
         except Exception as e:
-            self.logger.error(f"Failed to initialize application: {e}")
+            self.logger.error("Failed to initialize application: %s", e)
             raise
     
     def _init_core_managers(self):
@@ -113,27 +169,16 @@ class GamingHelperApp(QObject):
         )
     
     def _init_ui_components(self):
-        """Initialize UI components."""
-        # Main window (hidden by default)
-        self.logger.info("[WINDOW] Creating Main Window...")
-        self.main_window = MainWindow(
-            config_manager=self.config_manager,
-            plugin_manager=self.plugin_manager
-        )
-        
-        # Control panel
-        self.logger.info("[PANEL] Creating Control Panel...")
-        self.control_panel = ControlPanel(
-            config_manager=self.config_manager,
-            plugin_manager=self.plugin_manager,
-            thread_manager=self.thread_manager
-        )
+        """Initialize UI components.
         
+        Main window and control panel are hidden at startup, so they are
+        built lazily by their properties the first time they are needed.
+        """
         # Floating icon
         self.logger.info("[ICON] Creating Floating Icon...")
         self.floating_icon = FloatingIcon(
             config_manager=self.config_manager,
-            control_panel=self.control_panel
+            get_control_panel=lambda: self.control_panel
         )
         
         # System tray
@@ -147,41 +192,59 @@ class GamingHelperApp(QObject):
         # Shutdown signal
         self.shutdown_requested.connect(self.shutdown)
         
+        # Any other way out of the event loop (last window closed, session
+        # logoff, QApplication.quit() from elsewhere) still cleans up
+        QApplication.instance().aboutToQuit.connect(self._on_about_to_quit)
+        
         # Plugin manager signals
         self.plugin_manager.plugin_activated.connect(self._on_plugin_activated)
         self.plugin_manager.plugin_deactivated.connect(self._on_plugin_deactivated)
-        
-        # Control panel signals
-        self.control_panel.close_requested.connect(self.control_panel.hide)
+        self.plugin_manager.discovery_complete.connect(self._on_plugins_discovered)
         
         # Floating icon signals
         self.floating_icon.clicked.connect(self._toggle_control_panel)
         
         # System tray signals
         if self.tray_manager.is_available():
-            self.tray_manager.show_main_window.connect(self.main_window.show)
+            self.tray_manager.show_main_window.connect(self._show_main_window)
             self.tray_manager.show_control_panel.connect(self._show_control_panel)
             self.tray_manager.quit_requested.connect(self.shutdown)
     
+    @Slot()
     def _load_plugins(self):
-        """Load and initialize plugins."""
-        self.plugin_manager.discover_plugins()
+        """Start plugin discovery in the background (instances are created on demand)."""
+        self.logger.info("[PLUGINS] Loading plugins...")
+        if not self.plugin_manager.discover_plugins_async():
+            self._on_plugins_discovered(self.plugin_manager.discover_plugins())
+    
+    @Slot(list)
+    def _on_plugins_discovered(self, plugin_names):
+        """Register discovered plugins once the background scan is done."""
         self.plugin_manager.load_enabled_plugins()
     
+    @Slot(str)
     def _on_plugin_activated(self, plugin_name):
         """Handle plugin activation."""
-        self.logger.info(f"[PLUGIN-ON] Plugin activated: {plugin_name}")
+        self.logger.info("[PLUGIN-ON] Plugin activated: %s", plugin_name)
     
+    @Slot(str)
     def _on_plugin_deactivated(self, plugin_name):
         """Handle plugin deactivation."""
-        self.logger.info(f"[PLUGIN-OFF] Plugin deactivated: {plugin_name}")
+        self.logger.info("[PLUGIN-OFF] Plugin deactivated: %s", plugin_name)
+    
+    @Slot()
+    def _show_main_window(self):
+        """Show main window."""
+        self.main_window.show()
     
+    @Slot()
     def _show_control_panel(self):
         """Show control panel."""
         self.control_panel.show()
         self.control_panel.raise_()
         self.control_panel.activateWindow()
 
+    @Slot()
     def _toggle_control_panel(self):
         """Toggle control panel visibility."""
         if self.control_panel.isVisible():
@@ -191,6 +254,7 @@ class GamingHelperApp(QObject):
             self.control_panel.raise_()
             self.control_panel.activateWindow()
     
+    @Slot()
     def shutdown(self):
         """Gracefully shutdown the application."""
         if self.is_shutting_down:
@@ -203,7 +267,7 @@ class GamingHelperApp(QObject):
             # Save configuration
             if self.config_manager:
                 self.logger.info("[SAVE] Saving configuration...")
-                self.config_manager.save_config()
+                self.config_manager.save_config(force=True)
             
             # Shutdown plugins
             if self.plugin_manager:
@@ -216,21 +280,52 @@ class GamingHelperApp(QObject):
                 self.thread_manager.shutdown_all_threads()
             
             # Close UI components
-            if self.control_panel:
+            if self._control_panel:
                 self.logger.info("[PANEL] Closing Control Panel...")
-                self.control_panel.close()
+                self._control_panel.close()
             
             if self.floating_icon:
                 self.logger.info("[ICON] Closing Floating Icon...")
                 self.floating_icon.close()
             
-            if self.main_window:
+            if self._main_window:
                 self.logger.info("[WINDOW] Closing Main Window...")
-                self.main_window.close()
+                self._main_window.close()
             
             # Quit application
             self.logger.info("[EXIT] Application shutdown complete")
             QApplication.quit()
             
         except Exception as e:
-            self.logger.error(f"Error during shutdown: {e}")
+            self.logger.error("Error during shutdown: %s", e)
+        
+        finally:
+            self._close_logging()
+    
+    @Slot()
+    def _on_about_to_quit(self):
+        """Release what must not outlive the event loop if shutdown() did not run."""
+        if self.is_shutting_down:
+            return
+        
+        if self.config_manager:
+            self.config_manager.save_config(force=True)
+            self.config_manager.flush_plugin_configs()
+        
+        if self.thread_manager:
+            self.thread_manager.shutdown_all_threads()
+        
+        self._close_logging()
+    
+    def _close_logging(self):
+        """Stop the logging thread and release the handlers installed by _setup_logging."""
+        if self._log_listener:
+            self._log_listener.stop()
+            self._log_listener = None
+        
+        root_logger = logging.getLogger()
+        for handler in self._log_handlers:
+            root_logger.removeHandler(handler)
+            handler.close()  # MemoryHandler.close() flushes to the file first
+        self._log_handlers = ()
+        self._log_buffer = None
@@ -3,11 +3,195 @@ Configuration Manager
 Handles loading, saving and managing application configuration.
 """
 
+import os
+import copy
+import hashlib
+import threading
 import yaml
 import logging
+from contextlib import contextmanager
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, Any, Optional
-from PySide6.QtCore import QObject, Signal
+from typing import Dict, Any, Optional, Tuple
+from PySide6.QtCore import QMetaObject, QObject, QThread, QThreadPool, QTimer, Qt, Signal, Slot
+
+# Prefer the libyaml C parser/emitter when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader, CSafeDumper as _SafeDumper
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader, SafeDumper as _SafeDumper
+
+def _flatten(tree: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten nested dicts into a {"dotted.key": leaf_value} mapping."""
+    flat = {}
+    stack = [("", tree)]
+    while stack:
+        prefix, node = stack.pop()
+        for key, value in node.items():
+            path = f"{prefix}{key}"
+            if isinstance(value, dict) and value:
+                stack.append((f"{path}.", value))
+            else:
+                flat[path] = value
+    return flat
+
+
+# Marker for keys that are not present in the configuration
+_MISSING = object()
+
+# Configuration locations, resolved once at import
+_PKG_ROOT = Path(__file__).resolve().parent.parent
+_CONFIG_DIR = _PKG_ROOT / "config"
+_PLUGINS_CONFIG_DIR = _CONFIG_DIR / "plugins"
+
+
+@lru_cache(maxsize=None)
+def _ensure_config_dirs() -> None:
+    """Create the configuration directories (once per process)."""
+    _PLUGINS_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+
+
+@contextmanager
+def _atomic_open(path: Path):
+    """Open a temporary sibling of path for binary writing.
+    
+    On success the data is fsynced and moved over path with os.replace, so
+    readers never see a truncated file if the process dies mid-write. The
+    temporary name is unique per thread, so concurrent writers never share it.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+# Delay before a pending configuration write is flushed to disk
+SAVE_DEBOUNCE_MS = 500
+
+# Delay before queued plugin configurations are written
+PLUGIN_SAVE_DEBOUNCE_MS = 200
+
+
+@lru_cache(maxsize=512)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """Split a dot-notation key into its path components."""
+    return tuple(key.split('.'))
+
+
+class _ConfigStore:
+    """Plain-Python configuration storage with cached dot-notation reads.
+    
+    Holds no Qt state, so reads on hot paths (paint code, plugin loops)
+    avoid the QObject binding layer. ConfigManager wraps it and adds the
+    config_changed signal and persistence.
+    """
+    
+    __slots__ = ('_data', '_flat_cache', '_dirty')
+    
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self._data: Dict[str, Any] = data if data is not None else {}
+        # Resolved values by dotted key; cleared whenever the data changes
+        self._flat_cache: Dict[str, Any] = {}
+        # True while there are changes not yet written to disk
+        self._dirty = False
+    
+    @property
+    def data(self) -> Dict[str, Any]:
+        """The underlying configuration tree."""
+        return self._data
+    
+    @property
+    def dirty(self) -> bool:
+        """True while there are changes not yet written to disk."""
+        return self._dirty
+    
+    def mark_dirty(self) -> None:
+        """Record that the data has changes not yet written to disk."""
+        self._dirty = True
+    
+    def mark_clean(self) -> None:
+        """Record that the data on disk matches the store."""
+        self._dirty = False
+    
+    def replace(self, data: Dict[str, Any]) -> None:
+        """Swap in a new configuration tree."""
+        self._data = data
+        self._flat_cache.clear()
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get configuration value using dot notation."""
+        try:
+            return self._flat_cache[key]
+        except KeyError:
+            pass
+        
+        value = self._data
+        try:
+            for k in _split_key(key):
+                value = value[k]
+        except (KeyError, TypeError):
+            return default
+        
+        self._flat_cache[key] = value
+        return value
+    
+    def set(self, key: str, value: Any) -> bool:
+        """Set configuration value using dot notation.
+        
+        Returns True if the stored value actually changed.
+        """
+        keys = _split_key(key)
+        config = self._data
+        
+        # Navigate to the parent key
+        for k in keys[:-1]:
+            if k not in config:
+                config[k] = {}
+            config = config[k]
+        
+        # Set the value
+        old_value = config.get(keys[-1], _MISSING)
+        config[keys[-1]] = value
+        self._flat_cache.clear()
+        
+        # Identity check first avoids deep comparisons of unchanged subtrees
+        if old_value is value:
+            return False
+        try:
+            changed = old_value != value
+        except Exception:
+            changed = True
+        
+        if changed:
+            self._dirty = True
+        return changed
+    
+    def merge_defaults(self, flat_defaults: Dict[str, Any]) -> None:
+        """Insert any missing keys from a flattened defaults mapping."""
+        self._flat_cache.clear()
+        
+        # Single pass over the flattened defaults; values found or inserted
+        # here also warm the get() cache
+        for key, default in flat_defaults.items():
+            *parents, leaf = _split_key(key)
+            node = self._data
+            for k in parents:
+                if k not in node:
+                    node[k] = {}
+                node = node[k]
+                if not isinstance(node, dict):
+                    # User replaced this section with a non-dict value; keep it
+                    break
+            else:
+                if leaf not in node:
+                    node[leaf] = copy.deepcopy(default)
+                self._flat_cache[key] = node[leaf]
 
 
 class ConfigManager(QObject):
@@ -20,16 +204,46 @@ class ConfigManager(QObject):
         super().__init__()
         
         self.logger = logging.getLogger("ConfigManager")
-        self.config_dir = Path(__file__).parent.parent / "config"
+        self.config_dir = _CONFIG_DIR
         self.config_file = self.config_dir / "config.yaml"
-        self.plugins_config_dir = self.config_dir / "plugins"
+        self.plugins_config_dir = _PLUGINS_CONFIG_DIR
         
         # Ensure config directories exist
-        self.config_dir.mkdir(exist_ok=True)
-        self.plugins_config_dir.mkdir(exist_ok=True)
+        _ensure_config_dirs()
         
         # Main configuration data
-        self.config = {}
+        self._store = _ConfigStore()
+        
+        # Debounced persistence: bursts of changes collapse into one write
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(SAVE_DEBOUNCE_MS)
+        self._flush_timer.timeout.connect(self._flush)
+        
+        # Plugin configs waiting to be written, by plugin config name; may be
+        # filled from worker threads (see queue_plugin_config)
+        self._pending_plugin_configs: Dict[str, Dict[str, Any]] = {}
+        self._plugin_configs_lock = threading.Lock()
+        self._plugin_flush_timer = QTimer(self)
+        self._plugin_flush_timer.setSingleShot(True)
+        self._plugin_flush_timer.setInterval(PLUGIN_SAVE_DEBOUNCE_MS)
+        self._plugin_flush_timer.timeout.connect(self._flush_plugin_configs_async)
+        
+        # Debounced plugin writes run on one background thread, in order;
+        # bytes being written are kept by plugin config name until done
+        self._plugin_writer = QThreadPool(self)
+        self._plugin_writer.setMaxThreadCount(1)
+        self._plugin_writes: Dict[str, bytes] = {}
+        
+        # config_changed emissions waiting for the next event loop pass;
+        # set() may run on worker threads, so they are guarded by a lock
+        self._pending_changes: Dict[str, Any] = {}
+        self._changes_lock = threading.Lock()
+        
+        # Digest of the bytes last read from or written to config_file
+        self._last_hash: Optional[bytes] = None
+        # Same, per plugin config file (guarded by _plugin_configs_lock)
+        self._plugin_hashes: Dict[Path, bytes] = {}
         
         # Default configuration
         self.default_config = {
@@ -84,16 +298,31 @@ class ConfigManager(QObject):
                 "emergency_hide": "Ctrl+Shift+H"
             }
         }
+        
+        # Private deep copy used to build fresh configs, so later edits to
+        # self.config can never leak back into the defaults
+        self._default_template = copy.deepcopy(self.default_config)
+        self._flat_defaults = _flatten(self._default_template)
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Main configuration data."""
+        return self._store.data
+    
+    @config.setter
+    def config(self, data: Dict[str, Any]) -> None:
+        self._store.replace(data)
     
     def load_config(self) -> bool:
         """Load configuration from file."""
         try:
             if self.config_file.exists():
-                with open(self.config_file, 'r', encoding='utf-8') as file:
-                    self.config = yaml.safe_load(file) or {}
+                data = self.config_file.read_bytes()
+                self._last_hash = self._digest(data)
+                self.config = yaml.load(data, Loader=_SafeLoader) or {}
                 self.logger.info("Configuration loaded successfully")
             else:
-                self.config = self.default_config.copy()
+                self.config = copy.deepcopy(self._default_template)
                 self.save_config()
                 self.logger.info("Created default configuration")
             
@@ -103,14 +332,34 @@ class ConfigManager(QObject):
             
         except Exception as e:
             self.logger.error(f"Failed to load configuration: {e}")
-            self.config = self.default_config.copy()
+            self.config = copy.deepcopy(self._default_template)
             return False
     
-    def save_config(self) -> bool:
-        """Save configuration to file."""
+    def save_config(self, force: bool = False) -> bool:
+        """Save configuration to file.
+        
+        Writes are debounced so that repeated calls within SAVE_DEBOUNCE_MS
+        result in a single write, and the call only reports that the write was
+        queued. Use force=True to write immediately and get the real result.
+        """
+        if not force:
+            self._store.mark_dirty()
+            self._start_flush_timer()
+            return True
+        
+        self._flush_timer.stop()
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as file:
-                yaml.dump(self.config, file, default_flow_style=False, indent=2)
+            data = yaml.dump(self.config, Dumper=_SafeDumper, default_flow_style=False, indent=2).encode('utf-8')
+            digest = self._digest(data)
+            if digest == self._last_hash:
+                self.logger.debug("Configuration unchanged, skipping save")
+                self._store.mark_clean()
+                return True
+            
+            with _atomic_open(self.config_file) as file:
+                file.write(data)
+            self._last_hash = digest
+            self._store.mark_clean()
             self.logger.info("Configuration saved successfully")
             return True
             
@@ -120,85 +369,183 @@ class ConfigManager(QObject):
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value using dot notation."""
-        keys = key.split('.')
-        value = self.config
-        
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+        return self._store.get(key, default)
     
     def set(self, key: str, value: Any) -> None:
         """Set configuration value using dot notation."""
-        keys = key.split('.')
-        config = self.config
-        
-        # Navigate to the parent key
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
-        
-        # Set the value
-        old_value = config.get(keys[-1])
-        config[keys[-1]] = value
+        if self._store.set(key, value):
+            self._queue_change(key, value)
+            self._start_flush_timer()
+    
+    def _start_flush_timer(self) -> None:
+        """(Re)start the debounced write; safe from any thread."""
+        if QThread.currentThread() is self.thread():
+            self._flush_timer.start()
+        else:
+            QMetaObject.invokeMethod(self._flush_timer, "start", Qt.QueuedConnection)
+    
+    def _queue_change(self, key: str, value: Any) -> None:
+        """Queue a config_changed emission; safe from any thread.
         
-        # Emit signal if value changed
-        if old_value != value:
+        Repeated keys keep only the last value.
+        """
+        with self._changes_lock:
+            schedule = not self._pending_changes
+            self._pending_changes[key] = value
+        if schedule:
+            QMetaObject.invokeMethod(self, "_emit_pending_changes", Qt.QueuedConnection)
+    
+    @Slot()
+    def _emit_pending_changes(self) -> None:
+        """Emit config_changed once per key changed since the last event loop pass."""
+        with self._changes_lock:
+            pending, self._pending_changes = self._pending_changes, {}
+        for key, value in pending.items():
             self.config_changed.emit(key, value)
     
+    @staticmethod
+    def _digest(data: bytes) -> bytes:
+        """Return a short content digest used to detect unchanged writes."""
+        return hashlib.blake2b(data, digest_size=16).digest()
+    
+    def _flush(self) -> bool:
+        """Write pending configuration changes to disk and return the result."""
+        if self._store.dirty:
+            return self.save_config(force=True)
+        return True
+    
     def get_plugin_config(self, plugin_name: str) -> Dict[str, Any]:
         """Get configuration for a specific plugin."""
+        with self._plugin_configs_lock:
+            pending = self._pending_plugin_configs.get(plugin_name)
+            if pending is not None:
+                return copy.deepcopy(pending)
+            writing = self._plugin_writes.get(plugin_name)
+        if writing is not None:
+            return yaml.load(writing, Loader=_SafeLoader) or {}
+        
         plugin_config_file = self.plugins_config_dir / f"{plugin_name}.yaml"
         
         if plugin_config_file.exists():
             try:
-                with open(plugin_config_file, 'r', encoding='utf-8') as file:
-                    return yaml.safe_load(file) or {}
+                data = plugin_config_file.read_bytes()
+                with self._plugin_configs_lock:
+                    self._plugin_hashes[plugin_config_file] = self._digest(data)
+                return yaml.load(data, Loader=_SafeLoader) or {}
             except Exception as e:
                 self.logger.error(f"Failed to load plugin config for {plugin_name}: {e}")
         
         return {}
     
     def save_plugin_config(self, plugin_name: str, config: Dict[str, Any]) -> bool:
-        """Save configuration for a specific plugin."""
+        """Save configuration for a specific plugin (skipped if the file already matches)."""
+        try:
+            data = self._dump_plugin_config(config)
+        except Exception as e:
+            self.logger.error(f"Failed to save plugin config for {plugin_name}: {e}")
+            return False
+        return self._write_plugin_config(plugin_name, data)
+    
+    @staticmethod
+    def _dump_plugin_config(config: Dict[str, Any]) -> bytes:
+        """Serialize a plugin configuration to YAML bytes."""
+        return yaml.dump(config, Dumper=_SafeDumper, default_flow_style=False, indent=2).encode('utf-8')
+    
+    def _write_plugin_config(self, plugin_name: str, data: bytes) -> bool:
+        """Write serialized plugin config bytes unless the file already holds them."""
         plugin_config_file = self.plugins_config_dir / f"{plugin_name}.yaml"
         
         try:
-            with open(plugin_config_file, 'w', encoding='utf-8') as file:
-                yaml.dump(config, file, default_flow_style=False, indent=2)
+            digest = self._digest(data)
+            with self._plugin_configs_lock:
+                unchanged = self._plugin_hashes.get(plugin_config_file) == digest
+            if unchanged:
+                self.logger.debug(f"Plugin config for {plugin_name} unchanged, skipping save")
+                return True
+            
+            with _atomic_open(plugin_config_file) as file:
+                file.write(data)
+            with self._plugin_configs_lock:
+                self._plugin_hashes[plugin_config_file] = digest
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to save plugin config for {plugin_name}: {e}")
             return False
     
+    def queue_plugin_config(self, plugin_name: str, config: Dict[str, Any]) -> None:
+        """Queue a plugin configuration write.
+        
+        Repeated saves within PLUGIN_SAVE_DEBOUNCE_MS collapse into one write
+        per plugin. May be called from worker threads; those writes are left
+        for the next flush_plugin_configs() call.
+        """
+        with self._plugin_configs_lock:
+            self._pending_plugin_configs[plugin_name] = config
+        
+        if QThread.currentThread() is self.thread():
+            self._plugin_flush_timer.start()
+    
+    def flush_plugin_configs(self) -> None:
+        """Write all queued plugin configurations now.
+        
+        Waits for background writes already in progress, so the files end
+        up with the latest configuration.
+        """
+        if QThread.currentThread() is self.thread():
+            self._plugin_flush_timer.stop()
+        
+        with self._plugin_configs_lock:
+            pending, self._pending_plugin_configs = self._pending_plugin_configs, {}
+        
+        self._plugin_writer.waitForDone()
+        for plugin_name, config in pending.items():
+            self.save_plugin_config(plugin_name, config)
+    
+    def _flush_plugin_configs_async(self) -> None:
+        """Serialize queued plugin configurations and write them in the background.
+        
+        Serializing here, on the owning thread, snapshots each config before
+        callers can mutate it again; only the file I/O leaves the thread.
+        """
+        with self._plugin_configs_lock:
+            pending, self._pending_plugin_configs = self._pending_plugin_configs, {}
+        
+        for plugin_name, config in pending.items():
+            try:
+                data = self._dump_plugin_config(config)
+            except Exception as e:
+                self.logger.error(f"Failed to save plugin config for {plugin_name}: {e}")
+                continue
+            with self._plugin_configs_lock:
+                self._plugin_writes[plugin_name] = data
+            self._plugin_writer.start(partial(self._background_plugin_write, plugin_name, data))
+    
+    def _background_plugin_write(self, plugin_name: str, data: bytes) -> None:
+        """Writer thread: write one plugin config, then stop serving it from memory."""
+        try:
+            self._write_plugin_config(plugin_name, data)
+        finally:
+            with self._plugin_configs_lock:
+                if self._plugin_writes.get(plugin_name) is data:
+                    del self._plugin_writes[plugin_name]
+    
     def _merge_with_defaults(self) -> None:
         """Merge current config with defaults to ensure all keys exist."""
-        def merge_dict(default: dict, current: dict) -> dict:
-            result = default.copy()
-            for key, value in current.items():
-                if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                    result[key] = merge_dict(result[key], value)
-                else:
-                    result[key] = value
-            return result
-        
-        self.config = merge_dict(self.default_config, self.config)
+        self._store.merge_defaults(self._flat_defaults)
     
     def reset_to_defaults(self) -> None:
         """Reset configuration to default values."""
-        self.config = self.default_config.copy()
+        self.config = copy.deepcopy(self._default_template)
         self.save_config()
         self.logger.info("Configuration reset to defaults")
     
     def export_config(self, file_path: Path) -> bool:
         """Export configuration to a file."""
         try:
-            with open(file_path, 'w', encoding='utf-8') as file:
-                yaml.dump(self.config, file, default_flow_style=False, indent=2)
+            with _atomic_open(Path(file_path)) as file:
+                yaml.dump(self.config, file, Dumper=_SafeDumper, default_flow_style=False, indent=2,
+                          encoding='utf-8')
             return True
         except Exception as e:
             self.logger.error(f"Failed to export configuration: {e}")
@@ -208,7 +555,7 @@ class ConfigManager(QObject):
         """Import configuration from a file."""
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
-                imported_config = yaml.safe_load(file)
+                imported_config = yaml.load(file, Loader=_SafeLoader)
             
             if imported_config:
                 self.config = imported_config
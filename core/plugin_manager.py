@@ -3,21 +3,72 @@ Plugin Manager
 Discovers, loads, and manages all plugins.
 """
 
+import ast
+import builtins
+import functools
 import importlib
 import importlib.util
-import inspect
+import json
 import logging
+import os
+import sys
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Dict, List, Type, Any, Optional
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, Signal, Slot
 
-from core.config_manager import ConfigManager
+from core.config_manager import ConfigManager, _atomic_open
 from core.thread_manager import ThreadManager
 
+_PKG_ROOT = Path(__file__).resolve().parent.parent
+_PLUGINS_DIR = _PKG_ROOT / "plugins"
+
+# Discovery cache: plugin metadata keyed by source file and its stat signature
+_PLUGIN_CACHE_NAME = "plugin_cache.json"
+_PLUGIN_CACHE_VERSION = 2
+
+# Maps a plugin display name to its config name (safe filename)
+_CONFIG_NAME_TRANS = str.maketrans({" ": "_", "/": "_", "\\": "_"})
+
+# Upper bound on threads used to parse changed plugin files during discovery
+_DISCOVERY_WORKERS = min(8, os.cpu_count() or 1)
+
+# ThreadManager thread name used by discover_plugins_async()
+_DISCOVERY_THREAD = "plugin_discovery"
+
+# Upper bound on threads running plugin shutdown_io() hooks at exit
+_SHUTDOWN_WORKERS = 4
+
+
+def _import_plugin_module(plugin_file: Path):
+    """Import a plugin module from its source file.
+    
+    Files in the plugins package are imported as plugins.<name>, so they
+    share sys.modules with regular imports; anything else (or a failure to
+    resolve the package) falls back to loading the file directly.
+    """
+    if plugin_file.parent == _PLUGINS_DIR:
+        module_name = f"plugins.{plugin_file.stem}"
+        try:
+            return importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name not in ("plugins", module_name):
+                raise
+    
+    spec = importlib.util.spec_from_file_location(plugin_file.stem, plugin_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
 
 class BasePlugin(QObject):
     """Base class for all plugins."""
     
+    # No __slots__ here: shiboken wrappers always keep an instance __dict__,
+    # and slot storage on QObject subclasses crashes PySide6 on teardown.
+    
     # Plugin metadata
     name = "Base Plugin"
     description = "Base plugin class"
@@ -29,12 +80,19 @@ class BasePlugin(QObject):
     data_updated = Signal(dict)  # plugin data
     error_occurred = Signal(str)  # error message
     
+    # Shared by all instances of a plugin class; see __init_subclass__
+    _class_logger = logging.getLogger(f"Plugin.{name}")
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._class_logger = logging.getLogger(f"Plugin.{cls.name}")
+    
     def __init__(self, config_manager: ConfigManager, thread_manager: ThreadManager):
         super().__init__()
         
         self.config_manager = config_manager
         self.thread_manager = thread_manager
-        self.logger = logging.getLogger(f"Plugin.{self.name}")
+        self.logger = self._class_logger
         
         # Plugin state
         self.is_active = False
@@ -42,21 +100,29 @@ class BasePlugin(QObject):
         self.panel_widget = None
         
         # Plugin configuration - create safe filename
-        safe_name = self.name.lower().replace(" ", "_").replace("/", "_").replace("\\", "_")
-        self.plugin_config = self.config_manager.get_plugin_config(safe_name)
+        self._safe_name = self.name.lower().translate(_CONFIG_NAME_TRANS)
+        self.plugin_config = self.config_manager.get_plugin_config(self._safe_name)
+    
+    @property
+    def safe_name(self) -> str:
+        """Plugin name as used for its config file and in plugins.enabled."""
+        return self._safe_name
     
     def initialize(self) -> bool:
         """Initialize the plugin. Override in subclasses."""
         try:
             self.is_initialized = True
-            self.logger.info(f"Plugin '{self.name}' initialized")
+            self.logger.info("Plugin '%s' initialized", self.name)
             return True
         except Exception as e:
-            self.logger.error(f"Failed to initialize plugin '{self.name}': {e}")
+            self.logger.error("Failed to initialize plugin '%s': %s", self.name, e)
             return False
     
     def activate(self) -> bool:
         """Activate the plugin. Override in subclasses."""
+        if self.is_active:
+            return True
+        
         try:
             if not self.is_initialized:
                 if not self.initialize():
@@ -64,15 +130,18 @@ class BasePlugin(QObject):
             
             self.is_active = True
             self.status_changed.emit("activated")
-            self.logger.info(f"Plugin '{self.name}' activated")
+            self.logger.info("Plugin '%s' activated", self.name)
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to activate plugin '{self.name}': {e}")
+            self.logger.error("Failed to activate plugin '%s': %s", self.name, e)
             return False
     
     def deactivate(self) -> bool:
         """Deactivate the plugin. Override in subclasses."""
+        if not self.is_active:
+            return True
+        
         try:
             self.is_active = False
             
@@ -81,15 +150,26 @@ class BasePlugin(QObject):
                 self.panel_widget.hide()
             
             self.status_changed.emit("deactivated")
-            self.logger.info(f"Plugin '{self.name}' deactivated")
+            self.logger.info("Plugin '%s' deactivated", self.name)
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to deactivate plugin '{self.name}': {e}")
+            self.logger.error("Failed to deactivate plugin '%s': %s", self.name, e)
             return False
     
+    def shutdown_io(self) -> bool:
+        """Release non-UI resources (files, sockets, pending saves). Override in subclasses.
+        
+        Called before shutdown(), possibly from a worker thread, so it must
+        not touch widgets or timers.
+        """
+        return True
+    
     def shutdown(self) -> bool:
-        """Shutdown the plugin. Override in subclasses."""
+        """Shutdown the plugin. Override in subclasses.
+        
+        Runs on the GUI thread after shutdown_io().
+        """
         try:
             if self.is_active:
                 self.deactivate()
@@ -100,11 +180,11 @@ class BasePlugin(QObject):
                 self.panel_widget = None
             
             self.is_initialized = False
-            self.logger.info(f"Plugin '{self.name}' shut down")
+            self.logger.info("Plugin '%s' shut down", self.name)
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to shutdown plugin '{self.name}': {e}")
+            self.logger.error("Failed to shutdown plugin '%s': %s", self.name, e)
             return False
     
     def get_panel_widget(self):
@@ -116,13 +196,9 @@ class BasePlugin(QObject):
         return None
     
     def save_config(self) -> bool:
-        """Save plugin configuration."""
-        # Create a safe filename by replacing problematic characters
-        safe_name = self.name.lower().replace(" ", "_").replace("/", "_").replace("\\", "_")
-        return self.config_manager.save_plugin_config(
-            safe_name,
-            self.plugin_config
-        )
+        """Save plugin configuration (written shortly after, batched with other saves)."""
+        self.config_manager.queue_plugin_config(self._safe_name, self.plugin_config)
+        return True
     
     def get_info(self) -> Dict[str, Any]:
         """Get plugin information."""
@@ -136,11 +212,208 @@ class BasePlugin(QObject):
         }
 
 
+@dataclass(slots=True)
+class PluginDescriptor:
+    """Plugin metadata read from source; the plugin module is imported on load."""
+    name: str
+    description: str
+    version: str
+    author: str
+    module_file: str
+    class_name: str
+    
+    def get_info(self) -> Dict[str, Any]:
+        """Get plugin information for a plugin that has not been loaded."""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "version": self.version,
+            "author": self.author,
+            "is_active": False,
+            "is_initialized": False
+        }
+
+
+# Metadata a plugin class inherits when it does not define its own
+_METADATA_DEFAULTS = {
+    "name": BasePlugin.name,
+    "description": BasePlugin.description,
+    "version": BasePlugin.version,
+    "author": BasePlugin.author
+}
+
+# _plugin_classes marker for a base class known not to derive from BasePlugin
+_NOT_PLUGIN = object()
+
+
+def _prefetch_files(paths: List[Path]) -> None:
+    """Ask the kernel to start reading files into the page cache (POSIX only)."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _check_import(node: ast.stmt) -> None:
+    """Raise ModuleNotFoundError if a top-level import of a plugin cannot be resolved."""
+    if isinstance(node, ast.ImportFrom):
+        if node.level:
+            return
+        names = [node.module]
+    else:
+        names = [alias.name for alias in node.names]
+    
+    for name in names:
+        package = name.partition('.')[0]
+        if package not in sys.modules and importlib.util.find_spec(package) is None:
+            raise ModuleNotFoundError(f"No module named '{package}'", name=package)
+
+
+def _module_source(root: Path, module: Optional[str]) -> Optional[Path]:
+    """Source file of a project module, given as a dotted name under root."""
+    base = root.joinpath(*module.split('.')) if module else root
+    for candidate in (base.parent / f"{base.name}.py", base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _import_source(origin: Path, level: int, module: Optional[str]) -> Optional[Path]:
+    """Source file an import in origin refers to, or None if it is not project code."""
+    if not level:
+        return _module_source(_PKG_ROOT, module)
+    root = origin.parent
+    for _ in range(level - 1):
+        root = root.parent
+    return _module_source(root, module)
+
+
+def _file_plugin_classes(source: Path, memo: Dict[Path, Dict[str, Dict[str, str]]]) -> Dict[str, Dict[str, str]]:
+    """Plugin classes defined in another project file, parsed once per scan."""
+    if source not in memo:
+        memo[source] = {}  # Breaks import cycles
+        try:
+            tree = ast.parse(source.read_bytes(), filename=str(source))
+        except (OSError, SyntaxError, ValueError) as e:
+            logging.getLogger("PluginManager").debug(f"Cannot inspect plugin base module {source}: {e}")
+        else:
+            memo[source] = _plugin_classes(tree, source, memo)
+    return memo[source]
+
+
+def _plugin_classes(tree: ast.Module, source: Path,
+                    memo: Dict[Path, Dict[str, Dict[str, str]]]) -> Dict[str, Dict[str, str]]:
+    """Map each class in tree deriving from BasePlugin to its metadata.
+    
+    Base classes are followed through classes defined earlier in the same
+    module and through names imported from other project modules, so
+    indirect subclasses are found as an issubclass() check would find them.
+    Metadata is inherited from the first plugin base and overridden by the
+    class's own string-literal attributes.
+    """
+    imported = {}  # local name -> (project source or None, imported name or None for a module)
+    local_classes = set()
+    plugins = {}
+    
+    def resolve(base: ast.expr):
+        """Metadata of a plugin base, _NOT_PLUGIN, or None if it cannot be resolved."""
+        if isinstance(base, ast.Name):
+            name, attr = base.id, None
+        elif isinstance(base, ast.Attribute) and isinstance(base.value, ast.Name):
+            name, attr = base.value.id, base.attr
+        else:
+            return None
+        
+        if (attr or name) == "BasePlugin":
+            return _METADATA_DEFAULTS
+        if attr is None and name in plugins:
+            return plugins[name]
+        if attr is None and name in local_classes:
+            return _NOT_PLUGIN
+        if name not in imported:
+            return _NOT_PLUGIN if attr is None and hasattr(builtins, name) else None
+        
+        module_source, imported_name = imported[name]
+        if module_source is None:
+            return _NOT_PLUGIN  # Third-party code cannot derive from BasePlugin
+        if imported_name is None:
+            imported_name = attr  # base is module.Class
+        elif attr is not None:
+            return None
+        return _file_plugin_classes(module_source, memo).get(imported_name, _NOT_PLUGIN)
+    
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom):
+            module_source = _import_source(source, node.level, node.module)
+            for alias in node.names:
+                imported[alias.asname or alias.name] = (module_source, alias.name)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    imported[alias.asname] = (_import_source(source, 0, alias.name), None)
+        elif isinstance(node, ast.ClassDef):
+            local_classes.add(node.name)
+            inherited = None
+            for base in node.bases:
+                metadata = resolve(base)
+                if metadata is None:
+                    logging.getLogger("PluginManager").debug(
+                        f"Cannot resolve base {ast.unparse(base)} of {node.name} in {source}")
+                elif metadata is not _NOT_PLUGIN:
+                    inherited = metadata
+                    break
+            if inherited is None:
+                continue
+            
+            metadata = dict(inherited)
+            for stmt in node.body:
+                if (isinstance(stmt, ast.Assign) and 
+                    isinstance(stmt.value, ast.Constant) and 
+                    isinstance(stmt.value.value, str)):
+                    for target in stmt.targets:
+                        if isinstance(target, ast.Name) and target.id in metadata:
+                            metadata[target.id] = stmt.value.value
+            plugins[node.name] = metadata
+    return plugins
+
+
+def _scan_metadata(plugin_file: Path) -> List[PluginDescriptor]:
+    """Describe the plugin classes in a file without executing it.
+    
+    Classes deriving from BasePlugin, directly or through other classes,
+    are found with ast (see _plugin_classes). Unconditional top-level
+    imports must be resolvable so plugins with missing dependencies are
+    reported at discovery time, as they were when discovery imported them.
+    """
+    tree = ast.parse(plugin_file.read_bytes(), filename=str(plugin_file))
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            _check_import(node)
+    
+    plugins = _plugin_classes(tree, plugin_file, {plugin_file: {}})
+    return [
+        PluginDescriptor(module_file=str(plugin_file), class_name=class_name, **metadata)
+        for class_name, metadata in plugins.items()
+    ]
+
+
 class PluginManager(QObject):
     """Manages all plugins in the application."""
     
     # Signals
     plugin_discovered = Signal(str)  # plugin_name
+    plugins_discovered = Signal(list)  # plugin names, once per discovery pass
+    discovery_complete = Signal(list)  # plugin names, after discover_plugins_async()
     plugin_loaded = Signal(str)  # plugin_name
     plugin_activated = Signal(str)  # plugin_name
     plugin_deactivated = Signal(str)  # plugin_name
@@ -153,67 +426,207 @@ class PluginManager(QObject):
         self.thread_manager = thread_manager
         self.logger = logging.getLogger("PluginManager")
         
+        # Background discovery results arrive through the thread manager
+        self.thread_manager.thread_finished.connect(self._on_thread_finished)
+        
         # Plugin storage
-        self.available_plugins: Dict[str, Type[BasePlugin]] = {}
+        self.available_plugins: Dict[str, PluginDescriptor] = {}
         self.loaded_plugins: Dict[str, BasePlugin] = {}
         
-        # Plugin directory
-        self.plugins_dir = Path(__file__).parent.parent / "plugins"
+        # Config names of enabled plugins, mirrored to plugins.enabled
+        self._enabled_set = set(self.config_manager.get("plugins.enabled", []))
+        
+        # Display name <-> config name, rebuilt by discover_plugins()
+        self._name_to_config: Dict[str, str] = {}
+        self._config_to_name: Dict[str, str] = {}
+        
+        # Imported plugin classes by (module_file, class_name); entries live
+        # as long as the class is referenced (e.g. by a loaded instance)
+        self._plugin_classes = weakref.WeakValueDictionary()
+        
+        # Plugin directory and discovery cache
+        self.plugins_dir = _PLUGINS_DIR
+        self.plugin_cache_file = config_manager.config_dir / _PLUGIN_CACHE_NAME
+    
+    def _rebuild_name_maps(self) -> None:
+        """Recompute the display name <-> config name maps from available_plugins."""
+        self._name_to_config = {
+            plugin_name: plugin_name.lower().translate(_CONFIG_NAME_TRANS)
+            for plugin_name in self.available_plugins
+        }
+        self._config_to_name = {
+            config_name: plugin_name
+            for plugin_name, config_name in self._name_to_config.items()
+        }
     
     def _get_plugin_config_name(self, plugin_name: str) -> str:
         """Convert plugin display name to config name (safe filename)."""
-        return plugin_name.lower().replace(" ", "_").replace("/", "_").replace("\\", "_")
+        try:
+            return self._name_to_config[plugin_name]
+        except KeyError:
+            return plugin_name.lower().translate(_CONFIG_NAME_TRANS)
     
     def _find_plugin_by_config_name(self, config_name: str) -> str:
         """Find plugin display name by config name."""
-        for plugin_name in self.available_plugins.keys():
-            if self._get_plugin_config_name(plugin_name) == config_name:
-                return plugin_name
-        return None
+        return self._config_to_name.get(config_name)
     
-    def discover_plugins(self) -> List[str]:
-        """Discover all available plugins."""
-        discovered = []
+    def _load_cache(self) -> Dict[str, Any]:
+        """Load the discovery cache ({source path: {mtime_ns, size, plugins}})."""
+        try:
+            with open(self.plugin_cache_file, 'r', encoding='utf-8') as file:
+                cache = json.load(file)
+            if cache.get("version") == _PLUGIN_CACHE_VERSION:
+                return cache.get("files", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {}
+    
+    def _save_cache(self, files: Dict[str, Any]) -> None:
+        """Write the discovery cache atomically; discovery may run on several threads."""
+        data = json.dumps({"version": _PLUGIN_CACHE_VERSION, "files": files}, indent=2)
+        try:
+            with _atomic_open(self.plugin_cache_file) as file:
+                file.write(data.encode('utf-8'))
+        except OSError as e:
+            self.logger.warning(f"Failed to write plugin cache: {e}")
+    
+    def _get_plugin_class(self, descriptor: PluginDescriptor) -> Type[BasePlugin]:
+        """Import the plugin module if needed and return the plugin class."""
+        key = (descriptor.module_file, descriptor.class_name)
+        plugin_class = self._plugin_classes.get(key)
+        if plugin_class is None:
+            module = _import_plugin_module(Path(descriptor.module_file))
+            plugin_class = getattr(module, descriptor.class_name)
+            # Discovery only saw the source, so check the class actually is a plugin
+            if not (isinstance(plugin_class, type) and issubclass(plugin_class, BasePlugin)):
+                raise TypeError(f"{descriptor.class_name} in {descriptor.module_file} "
+                                "is not a BasePlugin subclass")
+            self._plugin_classes[key] = plugin_class
+        return plugin_class
+    
+    def _scan_files(self, plugin_files: List[Path]) -> Dict[Path, Future]:
+        """Parse plugin files concurrently and return a finished future per file."""
+        if not plugin_files:
+            return {}
+        
+        # Start all reads up front so cold-cache disk I/O overlaps with parsing
+        _prefetch_files(plugin_files)
+        
+        with ThreadPoolExecutor(max_workers=min(_DISCOVERY_WORKERS, len(plugin_files)),
+                                thread_name_prefix="PluginScan") as executor:
+            return {plugin_file: executor.submit(_scan_metadata, plugin_file)
+                    for plugin_file in plugin_files}
+    
+    def _scan_plugins(self) -> List[PluginDescriptor]:
+        """Scan the plugins directory and return plugin descriptors in directory order.
+        
+        Plugin modules are not imported here: metadata is read from the
+        source with ast (see _scan_metadata), and files whose size and mtime
+        match the discovery cache are not even parsed. Changed files are
+        parsed in parallel. Only the cache file is written, so this can run
+        on a worker thread.
+        """
+        found = []
         
         try:
             if not self.plugins_dir.exists():
                 self.logger.warning("Plugins directory does not exist")
-                return discovered
+                return found
             
-            # Scan for Python files in plugins directory
-            for plugin_file in self.plugins_dir.glob("*.py"):
-                if plugin_file.name.startswith("__"):
+            cache = self._load_cache()
+            fresh_cache = {}
+            
+            # Scan for Python files in plugins directory, reusing cached
+            # metadata for files that have not changed
+            with os.scandir(self.plugins_dir) as it:
+                entries = [entry for entry in it
+                           if entry.name.endswith(".py") and
+                           not entry.name.startswith("__") and
+                           entry.is_file()]
+            
+            plugin_files = []
+            stale_files = []
+            for entry in entries:
+                plugin_file = Path(entry.path)
+                try:
+                    stat = entry.stat()
+                except OSError as e:
+                    self.logger.error(f"Failed to load plugin from {plugin_file}: {e}")
                     continue
                 
+                cached = cache.get(entry.path)
+                if not (cached and 
+                        cached["mtime_ns"] == stat.st_mtime_ns and 
+                        cached["size"] == stat.st_size):
+                    cached = None
+                    stale_files.append(plugin_file)
+                plugin_files.append((plugin_file, stat, cached))
+            
+            scanned = self._scan_files(stale_files)
+            
+            for plugin_file, stat, cached in plugin_files:
                 try:
-                    plugin_name = plugin_file.stem
-                    
-                    # Import the module
-                    spec = importlib.util.spec_from_file_location(plugin_name, plugin_file)
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
+                    if cached:
+                        descriptors = [PluginDescriptor(**entry) for entry in cached["plugins"]]
+                    else:
+                        descriptors = scanned[plugin_file].result()
                     
-                    # Find plugin classes
-                    for name, obj in inspect.getmembers(module, inspect.isclass):
-                        if (issubclass(obj, BasePlugin) and 
-                            obj != BasePlugin and 
-                            hasattr(obj, 'name')):
-                            
-                            self.available_plugins[obj.name] = obj
-                            discovered.append(obj.name)
-                            self.plugin_discovered.emit(obj.name)
-                            
-                            self.logger.info(f"Discovered plugin: {obj.name}")
+                    fresh_cache[str(plugin_file)] = {
+                        "mtime_ns": stat.st_mtime_ns,
+                        "size": stat.st_size,
+                        "plugins": [asdict(descriptor) for descriptor in descriptors]
+                    }
+                    found.extend(descriptors)
                 
                 except Exception as e:
                     self.logger.error(f"Failed to load plugin from {plugin_file}: {e}")
             
-            self.logger.info(f"Discovered {len(discovered)} plugins")
-            return discovered
+            if fresh_cache != cache:
+                self._save_cache(fresh_cache)
             
         except Exception as e:
             self.logger.error(f"Failed to discover plugins: {e}")
-            return discovered
+        
+        return found
+    
+    def _register_plugins(self, descriptors: List[PluginDescriptor]) -> List[str]:
+        """Register scanned plugins and emit the discovery signals."""
+        discovered = []
+        for descriptor in descriptors:
+            plugin_name = descriptor.name
+            self.available_plugins[plugin_name] = descriptor
+            discovered.append(plugin_name)
+            self.plugin_discovered.emit(plugin_name)
+            
+            self.logger.info(f"Discovered plugin: {plugin_name}")
+        
+        self._rebuild_name_maps()
+        
+        self.logger.info(f"Discovered {len(discovered)} plugins")
+        self.plugins_discovered.emit(discovered)
+        return discovered
+    
+    def discover_plugins(self) -> List[str]:
+        """Discover all available plugins.
+        
+        Plugin modules are only imported later, by load_plugin().
+        """
+        return self._register_plugins(self._scan_plugins())
+    
+    def discover_plugins_async(self) -> bool:
+        """Discover plugins on a background thread.
+        
+        The directory scan runs on a ThreadManager thread; registration
+        happens on the GUI thread, which then emits discovery_complete.
+        Returns False if the scan could not be started.
+        """
+        return self.thread_manager.start_thread(_DISCOVERY_THREAD, self._scan_plugins)
+    
+    @Slot(str, object)
+    def _on_thread_finished(self, thread_name: str, result: Any):
+        """Register the results of a background discovery scan."""
+        if thread_name == _DISCOVERY_THREAD:
+            self.discovery_complete.emit(self._register_plugins(result))
     
     def load_plugin(self, plugin_name: str) -> bool:
         """Load a specific plugin."""
@@ -226,16 +639,16 @@ class PluginManager(QObject):
                 self.logger.error(f"Plugin '{plugin_name}' not available")
                 return False
             
-            # Create plugin instance
-            plugin_class = self.available_plugins[plugin_name]
+            # Import the plugin module on first use and create the instance
+            plugin_class = self._get_plugin_class(self.available_plugins[plugin_name])
             plugin_instance = plugin_class(self.config_manager, self.thread_manager)
             
             # Connect signals
             plugin_instance.status_changed.connect(
-                lambda status, p=plugin_name: self._on_plugin_status_changed(p, status)
+                functools.partial(self._on_plugin_status_changed, plugin_name)
             )
             plugin_instance.error_occurred.connect(
-                lambda error, p=plugin_name: self.plugin_error.emit(p, error)
+                functools.partial(self.plugin_error.emit, plugin_name)
             )
             
             # Store loaded plugin
@@ -258,13 +671,15 @@ class PluginManager(QObject):
                     return False
             
             plugin = self.loaded_plugins[plugin_name]
+            if plugin.is_active:
+                return True
+            
             if plugin.activate():
                 # Add to enabled plugins list using config name
                 config_name = self._get_plugin_config_name(plugin_name)
-                enabled_plugins = self.config_manager.get("plugins.enabled", [])
-                if config_name not in enabled_plugins:
-                    enabled_plugins.append(config_name)
-                    self.config_manager.set("plugins.enabled", enabled_plugins)
+                if config_name not in self._enabled_set:
+                    self._enabled_set.add(config_name)
+                    self.config_manager.set("plugins.enabled", sorted(self._enabled_set))
                 
                 return True
             
@@ -281,13 +696,15 @@ class PluginManager(QObject):
                 return False
             
             plugin = self.loaded_plugins[plugin_name]
+            if not plugin.is_active:
+                return True
+            
             if plugin.deactivate():
                 # Remove from enabled plugins list using config name
                 config_name = self._get_plugin_config_name(plugin_name)
-                enabled_plugins = self.config_manager.get("plugins.enabled", [])
-                if config_name in enabled_plugins:
-                    enabled_plugins.remove(config_name)
-                    self.config_manager.set("plugins.enabled", enabled_plugins)
+                if config_name in self._enabled_set:
+                    self._enabled_set.discard(config_name)
+                    self.config_manager.set("plugins.enabled", sorted(self._enabled_set))
                 
                 return True
             
@@ -297,8 +714,11 @@ class PluginManager(QObject):
             self.logger.error(f"Failed to deactivate plugin '{plugin_name}': {e}")
             return False
     
-    def unload_plugin(self, plugin_name: str) -> bool:
-        """Unload a plugin."""
+    def unload_plugin(self, plugin_name: str, release_io: bool = True) -> bool:
+        """Unload a plugin.
+        
+        Pass release_io=False if the plugin's shutdown_io() already ran.
+        """
         try:
             if plugin_name not in self.loaded_plugins:
                 return True
@@ -306,6 +726,8 @@ class PluginManager(QObject):
             plugin = self.loaded_plugins[plugin_name]
             
             # Shutdown and remove
+            if release_io:
+                plugin.shutdown_io()
             plugin.shutdown()
             del self.loaded_plugins[plugin_name]
             
@@ -333,26 +755,51 @@ class PluginManager(QObject):
         return [name for name, plugin in self.loaded_plugins.items() if plugin.is_active]
     
     def load_enabled_plugins(self) -> None:
-        """Load all available plugins but keep them INACTIVE by default."""
-        self.logger.info("[PLUGINS] Loading available plugins (all will start INACTIVE)")
+        """Register all available plugins but keep them INACTIVE by default.
         
-        # Load all available plugins but don't activate them
-        for plugin_name in self.available_plugins.keys():
-            if plugin_name not in self.loaded_plugins:
-                self.load_plugin(plugin_name)
-                self.logger.info(f"[PLUGIN] Loaded plugin '{plugin_name}' (INACTIVE by default)")
+        Plugin instances are created lazily by load_plugin() the first time a
+        plugin is activated or its configuration is opened.
+        """
+        self.logger.info(f"[PLUGINS] {len(self.available_plugins)} plugins available "
+                         "(all will start INACTIVE and load on demand)")
         
         # Ensure all plugins start in INACTIVE state - clear any previous enabled state
+        self._enabled_set.clear()
         self.config_manager.set("plugins.enabled", [])
-        self.logger.info("[BLOCKED] All plugins loaded in INACTIVE state - no auto-activation")
+        self.logger.info("[BLOCKED] All plugins registered in INACTIVE state - no auto-activation")
+    
+    def _shutdown_plugin_io(self, plugin_name: str, plugin: BasePlugin) -> None:
+        """Run a plugin's shutdown_io() hook, logging instead of raising."""
+        try:
+            plugin.shutdown_io()
+        except Exception as e:
+            self.logger.error(f"Failed to release resources of plugin '{plugin_name}': {e}")
     
     def shutdown_all_plugins(self) -> None:
-        """Shutdown all loaded plugins."""
+        """Shutdown all loaded plugins.
+        
+        The non-UI part of every plugin's teardown (shutdown_io) runs
+        concurrently on a small thread pool. shutdown() closes widgets and
+        stops timers, so it then runs on the GUI thread one plugin at a time.
+        """
         self.logger.info("[PLUGIN] Shutting down all plugins...")
         
-        for plugin_name in list(self.loaded_plugins.keys()):
+        plugins = tuple(self.loaded_plugins.items())
+        if len(plugins) > 1:
+            with ThreadPoolExecutor(max_workers=min(_SHUTDOWN_WORKERS, len(plugins)),
+                                    thread_name_prefix="PluginShutdown") as executor:
+                for plugin_name, plugin in plugins:
+                    executor.submit(self._shutdown_plugin_io, plugin_name, plugin)
+        else:
+            for plugin_name, plugin in plugins:
+                self._shutdown_plugin_io(plugin_name, plugin)
+        
+        for plugin_name, _ in plugins:
             self.logger.info(f"[PLUGIN] Unloading plugin: {plugin_name}")
-            self.unload_plugin(plugin_name)
+            self.unload_plugin(plugin_name, release_io=False)
+        
+        # Write plugin configs saved during teardown
+        self.config_manager.flush_plugin_configs()
         
         self.logger.info("[SUCCESS] All plugins shut down")
     
@@ -3,47 +3,133 @@ Thread Manager
 Manages background threads and tasks for plugins and application components.
 """
 
+import os
+import queue
 import logging
 import threading
-from typing import Dict, Callable, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, Future
-from PySide6.QtCore import QObject, QThread, QTimer, Signal, QMutex
+import weakref
+from functools import partial
+from typing import Dict, List, Callable, Any, Optional
+from concurrent.futures import Future
+from PySide6.QtCore import (
+    QObject, QThread, QTimer, Signal, Slot, QMutex, QMutexLocker, QMetaObject, Qt
+)
+
+from core.ws_executor import WorkStealingExecutor
+
+# Bookkeeping is split across this many shards (a power of two, so the
+# shard index is a mask) to keep concurrent submitters off a single lock
+_SHARD_COUNT = 1 << (max(4, os.cpu_count() or 1) - 1).bit_length()
+
+# Pool workers with nothing to do for this long exit; new ones are spawned on demand
+_WORKER_IDLE_TIMEOUT_S = 30.0
+
+
+def _stop_workers(tasks: queue.SimpleQueue, workers: List['ManagedThread']) -> None:
+    """Wake every worker with a sentinel and wait for it, terminating stragglers.
+    
+    Module-level so it can also run from the manager's finalizer: a QThread
+    destroyed while still running aborts the process.
+    """
+    workers = tuple(workers)
+    for worker in workers:
+        worker.requestInterruption()
+        tasks.put(None)
+    for worker in workers:
+        if not worker.wait(5000):
+            worker.terminate()
+            worker.wait(1000)
+
+
+class _Shard:
+    """One slice of the thread/future bookkeeping with its own lock."""
+    
+    __slots__ = ('threads', 'futures', 'mutex')
+    
+    def __init__(self):
+        self.threads: Dict[str, '_ThreadTask'] = {}
+        self.futures: Dict[str, Future] = {}
+        self.mutex = QMutex()
+
+
+class _ThreadTask:
+    """A start_thread() job waiting for, or running on, a pool worker."""
+    
+    __slots__ = ('name', 'target', 'args', 'kwargs', 'worker', 'cancelled', 'done')
+    
+    # Guards the queued -> running/cancelled transition
+    _claim_lock = threading.Lock()
+    
+    def __init__(self, name: str, target: Callable, args: tuple, kwargs: dict):
+        self.name = name
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs
+        self.worker: Optional['ManagedThread'] = None
+        self.cancelled = False
+        self.done = threading.Event()
+    
+    def claim(self, worker: 'ManagedThread') -> bool:
+        """Mark the task as running on worker unless it was cancelled first."""
+        with self._claim_lock:
+            if self.cancelled:
+                return False
+            self.worker = worker
+            return True
+    
+    def cancel(self) -> bool:
+        """Cancel the task if no worker has picked it up yet."""
+        with self._claim_lock:
+            if self.worker is None:
+                self.cancelled = True
+            return self.cancelled
 
 
 class ManagedThread(QThread):
-    """Custom QThread with monitoring capabilities."""
+    """Long-lived pool worker that runs start_thread() jobs from a shared queue.
+    
+    An interrupted worker finishes its current job and then exits, since a
+    QThread's interruption flag cannot be cleared; the manager replaces it.
+    Workers left idle for _WORKER_IDLE_TIMEOUT_S retire the same way.
+    """
     
     # Signals
     task_started = Signal(str)  # thread_name
     task_finished = Signal(str, object)  # thread_name, result
     task_error = Signal(str, str)  # thread_name, error_message
+    task_done = Signal(str)  # thread_name, after finished/error
     
-    def __init__(self, name: str, target: Callable, *args, **kwargs):
+    def __init__(self, tasks: queue.SimpleQueue):
         super().__init__()
         
-        self.thread_name = name
-        self.target = target
-        self.args = args
-        self.kwargs = kwargs
-        self.result = None
-        self.error = None
-        self.is_running = False
+        self.tasks = tasks
+        self.current_task: Optional[_ThreadTask] = None
         
     def run(self):
-        """Execute the target function."""
-        try:
-            self.is_running = True
-            self.task_started.emit(self.thread_name)
+        """Run queued jobs until a None sentinel arrives, we are interrupted or idle."""
+        while not self.isInterruptionRequested():
+            try:
+                task = self.tasks.get(timeout=_WORKER_IDLE_TIMEOUT_S)
+            except queue.Empty:
+                break
+            if task is None:
+                break
+            if not task.claim(self):
+                continue
             
-            self.result = self.target(*self.args, **self.kwargs)
-            self.task_finished.emit(self.thread_name, self.result)
-            
-        except Exception as e:
-            self.error = str(e)
-            self.task_error.emit(self.thread_name, self.error)
-            
-        finally:
-            self.is_running = False
+            self.current_task = task
+            try:
+                self.task_started.emit(task.name)
+                result = task.target(*task.args, **task.kwargs)
+                self.task_finished.emit(task.name, result)
+                
+            except Exception as e:
+                self.task_error.emit(task.name, str(e))
+                
+            finally:
+                self.current_task = None
+                task.done.set()
+                self.task_done.emit(task.name)
 
 
 class ThreadManager(QObject):
@@ -61,98 +147,140 @@ class ThreadManager(QObject):
         self.logger = logging.getLogger("ThreadManager")
         self.max_workers = max_workers
         
-        # Thread tracking
-        self.active_threads: Dict[str, ManagedThread] = {}
-        self.thread_executor = ThreadPoolExecutor(max_workers=max_workers)
-        self.futures: Dict[str, Future] = {}
+        # Thread tracking, sharded by name
+        self._shards = tuple(_Shard() for _ in range(_SHARD_COUNT))
         
-        # Monitoring
-        self.mutex = QMutex()
-        self.monitor_timer = QTimer()
-        self.monitor_timer.timeout.connect(self._monitor_threads)
-        self.monitor_timer.start(1000)  # Check every second
+        # Persistent QThread workers for start_thread(), spawned on demand
+        self._thread_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._workers: List[ManagedThread] = []
+        self._shutting_down = False
+        
+        # Stops any live workers if the manager is collected (or the
+        # interpreter exits) without shutdown_all_threads()
+        weakref.finalize(self, _stop_workers, self._thread_queue, self._workers)
+        
+        self.thread_executor = WorkStealingExecutor(max_workers=max_workers)
         
         # Statistics
         self.total_threads_started = 0
         self.total_threads_completed = 0
         self.total_threads_failed = 0
+        
+        # threads_changed is coalesced to one emission per event-loop pass
+        self._changed_pending = False
+        self._changed_lock = threading.Lock()
+    
+    def _shard(self, name: str) -> _Shard:
+        """Return the shard that owns the given thread/task name."""
+        return self._shards[hash(name) & (_SHARD_COUNT - 1)]
+    
+    @property
+    def active_threads(self) -> Dict[str, _ThreadTask]:
+        """Snapshot of all queued or running start_thread() jobs by name."""
+        threads = {}
+        for shard in self._shards:
+            with QMutexLocker(shard.mutex):
+                threads.update(shard.threads)
+        return threads
+    
+    @property
+    def futures(self) -> Dict[str, Future]:
+        """Snapshot of all pending executor tasks by name."""
+        futures = {}
+        for shard in self._shards:
+            with QMutexLocker(shard.mutex):
+                futures.update(shard.futures)
+        return futures
     
     def start_thread(self, name: str, target: Callable, *args, **kwargs) -> bool:
-        """Start a new managed thread."""
+        """Queue target to run on a pool worker thread under the given name."""
+        shard = self._shard(name)
         try:
-            with QMutex():  # Thread-safe operation
-                if name in self.active_threads:
+            with QMutexLocker(shard.mutex):  # Only contends with same-shard names
+                if name in shard.threads:
                     self.logger.warning(f"Thread '{name}' already exists")
                     return False
-                
-                # Create and start thread
-                thread = ManagedThread(name, target, *args, **kwargs)
-                
-                # Connect signals
-                thread.task_started.connect(self._on_thread_started)
-                thread.task_finished.connect(self._on_thread_finished)
-                thread.task_error.connect(self._on_thread_error)
-                thread.finished.connect(lambda: self._cleanup_thread(name))
-                
-                # Store and start
-                self.active_threads[name] = thread
-                thread.start()
-                
-                self.total_threads_started += 1
-                self.threads_changed.emit()
-                
-                self.logger.info(f"Started thread: {name}")
-                return True
+                shard.threads[name] = task = _ThreadTask(name, target, args, kwargs)
+            
+            self._thread_queue.put(task)
+            self._ensure_workers()
+            
+            self.total_threads_started += 1
+            self._schedule_changed()
+            
+            self.logger.info(f"Started thread: {name}")
+            return True
                 
         except Exception as e:
             self.logger.error(f"Failed to start thread '{name}': {e}")
             return False
     
     def start_task(self, name: str, target: Callable, *args, **kwargs) -> bool:
-        """Start a task using ThreadPoolExecutor."""
-        try:
-            if name in self.futures:
+        """Start a task on the work-stealing executor."""
+        shard = self._shard(name)
+        
+        # Reserve the name atomically; the placeholder is swapped for the real
+        # future after submission so the executor call runs outside the lock
+        placeholder = Future()
+        with QMutexLocker(shard.mutex):
+            if shard.futures.setdefault(name, placeholder) is not placeholder:
                 self.logger.warning(f"Task '{name}' already exists")
                 return False
-            
+        
+        try:
             # Submit task to executor
             future = self.thread_executor.submit(target, *args, **kwargs)
-            self.futures[name] = future
+            
+            with QMutexLocker(shard.mutex):
+                reserved = shard.futures.get(name) is placeholder
+                if reserved:
+                    shard.futures[name] = future
+            if not reserved:
+                # stop_thread() dropped the reservation while we were submitting
+                future.cancel()
+                return False
             
             # Add callback for completion
-            future.add_done_callback(lambda f: self._task_completed(name, f))
+            future.add_done_callback(partial(self._task_completed, name))
             
             self.total_threads_started += 1
-            self.threads_changed.emit()
+            self._schedule_changed()
             
             self.logger.info(f"Started task: {name}")
             return True
             
         except Exception as e:
+            with QMutexLocker(shard.mutex):
+                if shard.futures.get(name) is placeholder:
+                    del shard.futures[name]
             self.logger.error(f"Failed to start task '{name}': {e}")
             return False
     
     def stop_thread(self, name: str) -> bool:
         """Stop a specific thread."""
+        shard = self._shard(name)
         try:
-            if name in self.active_threads:
-                thread = self.active_threads[name]
-                if thread.isRunning():
-                    thread.requestInterruption()
-                    thread.wait(5000)  # Wait up to 5 seconds
+            task = shard.threads.get(name)
+            if task is not None:
+                if not task.cancel():
+                    worker = task.worker
+                    worker.requestInterruption()
                     
-                    if thread.isRunning():
-                        thread.terminate()
-                        thread.wait(1000)
+                    if not task.done.wait(5):  # Wait up to 5 seconds
+                        worker.terminate()
+                        worker.wait(1000)
+                        # A terminated worker never reports task_done or
+                        # finished(); sweep once the event loop is back
+                        QTimer.singleShot(0, self._reap_finished_threads)
                     
                 self._cleanup_thread(name)
                 return True
                 
-            elif name in self.futures:
-                future = self.futures[name]
+            with QMutexLocker(shard.mutex):
+                future = shard.futures.pop(name, None)
+            if future is not None:
                 future.cancel()
-                del self.futures[name]
-                self.threads_changed.emit()
+                self._schedule_changed()
                 return True
                 
         except Exception as e:
@@ -162,18 +290,20 @@ class ThreadManager(QObject):
     
     def get_thread_status(self, name: str) -> Optional[Dict[str, Any]]:
         """Get status information for a specific thread."""
-        if name in self.active_threads:
-            thread = self.active_threads[name]
+        shard = self._shard(name)
+        task = shard.threads.get(name)
+        if task is not None:
+            finished = task.done.is_set()
             return {
                 "name": name,
                 "type": "QThread",
-                "running": thread.isRunning(),
-                "started": thread.isStarted(),
-                "finished": thread.isFinished()
+                "running": task.worker is not None and not finished,
+                "started": task.worker is not None,
+                "finished": finished
             }
         
-        elif name in self.futures:
-            future = self.futures[name]
+        future = shard.futures.get(name)
+        if future is not None:
             return {
                 "name": name,
                 "type": "Future",
@@ -188,19 +318,21 @@ class ThreadManager(QObject):
         """Get status of all active threads."""
         status = {}
         
-        for name in self.active_threads:
-            status[name] = self.get_thread_status(name)
-        
-        for name in self.futures:
-            status[name] = self.get_thread_status(name)
+        for shard in self._shards:
+            with QMutexLocker(shard.mutex):
+                names = (*shard.threads, *shard.futures)
+            for name in names:
+                info = self.get_thread_status(name)
+                if info is not None:
+                    status[name] = info
         
         return status
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get thread manager statistics."""
         return {
-            "active_threads": len(self.active_threads),
-            "active_tasks": len(self.futures),
+            "active_threads": sum(len(shard.threads) for shard in self._shards),
+            "active_tasks": sum(len(shard.futures) for shard in self._shards),
             "total_started": self.total_threads_started,
             "total_completed": self.total_threads_completed,
             "total_failed": self.total_threads_failed,
@@ -211,22 +343,86 @@ class ThreadManager(QObject):
         """Shutdown all active threads and tasks."""
         self.logger.info("Shutting down all threads...")
         
-        # Stop monitoring
-        self.monitor_timer.stop()
+        self._shutting_down = True
+        
+        # Ask every worker to stop before waiting on any of them, so the
+        # waits overlap instead of adding up
+        workers = tuple(self._workers)
+        for worker in workers:
+            worker.requestInterruption()
         
-        # Stop all QThreads
-        for name in list(self.active_threads.keys()):
+        # Stop all queued and running jobs
+        for name in self.active_threads:
             self.stop_thread(name)
         
+        # Wake idle workers so they see the interruption and exit
+        _stop_workers(self._thread_queue, workers)
+        self._workers.clear()
+        
         # Cancel all futures
-        for name, future in list(self.futures.items()):
+        for future in self.futures.values():
             future.cancel()
         
-        # Shutdown executor
-        self.thread_executor.shutdown(wait=True)
+        # Shutdown executor, dropping anything still queued
+        self.thread_executor.shutdown(wait=True, cancel_futures=True)
         
         self.logger.info("All threads shut down")
     
+    def _schedule_changed(self):
+        """Queue a single threads_changed emission; safe from any thread."""
+        with self._changed_lock:
+            if self._changed_pending:
+                return
+            self._changed_pending = True
+        QMetaObject.invokeMethod(self, "_flush_changed", Qt.QueuedConnection)
+    
+    @Slot()
+    def _flush_changed(self):
+        """Emit threads_changed once for everything since the last flush."""
+        with self._changed_lock:
+            self._changed_pending = False
+        self.threads_changed.emit()
+    
+    def _ensure_workers(self):
+        """Spawn pool workers so that no queued job waits behind busy ones.
+        
+        Up to max_workers are spawned eagerly, one per job. Past that, an
+        extra worker is added only while queued jobs outnumber the workers
+        not running a job (long-running jobs holding the whole pool); extras
+        retire after _WORKER_IDLE_TIMEOUT_S like any other worker.
+        """
+        while not self._shutting_down:
+            jobs = queued = 0
+            for shard in self._shards:
+                with QMutexLocker(shard.mutex):
+                    jobs += len(shard.threads)
+                    queued += sum(1 for task in shard.threads.values()
+                                  if task.worker is None and not task.cancelled)
+            
+            workers = len(self._workers)
+            if workers >= min(jobs, self.max_workers):
+                available = sum(1 for worker in self._workers if worker.current_task is None)
+                if queued <= available:
+                    break
+                self.logger.info(f"All {workers} pool workers busy - starting an extra worker")
+            
+            worker = ManagedThread(self._thread_queue)
+            worker.task_started.connect(self._on_thread_started)
+            worker.task_finished.connect(self._on_thread_finished)
+            worker.task_error.connect(self._on_thread_error)
+            worker.task_done.connect(self._cleanup_thread)
+            worker.finished.connect(self._on_worker_exited)
+            self._workers.append(worker)
+            worker.start()
+    
+    @Slot()
+    def _on_worker_exited(self):
+        """Forget a retired worker and replace it if jobs are still waiting."""
+        worker = self.sender()
+        if worker in self._workers:
+            self._workers.remove(worker)
+        self._ensure_workers()
+    
     def _on_thread_started(self, thread_name: str):
         """Handle thread started signal."""
         self.thread_started.emit(thread_name)
@@ -244,9 +440,11 @@ class ThreadManager(QObject):
     
     def _cleanup_thread(self, name: str):
         """Clean up a finished thread."""
-        if name in self.active_threads:
-            del self.active_threads[name]
-            self.threads_changed.emit()
+        shard = self._shard(name)
+        with QMutexLocker(shard.mutex):
+            removed = shard.threads.pop(name, None)
+        if removed is not None:
+            self._schedule_changed()
     
     def _task_completed(self, name: str, future: Future):
         """Handle task completion."""
@@ -265,17 +463,31 @@ class ThreadManager(QObject):
                 self.logger.info(f"Task '{name}' completed")
                 
         finally:
-            if name in self.futures:
-                del self.futures[name]
-                self.threads_changed.emit()
+            # Only drop our own entry; the name may already belong to a new task
+            shard = self._shard(name)
+            with QMutexLocker(shard.mutex):
+                removed = shard.futures.get(name) is future
+                if removed:
+                    del shard.futures[name]
+            if removed:
+                self._schedule_changed()
     
-    def _monitor_threads(self):
-        """Monitor thread health and clean up dead threads."""
+    def _reap_finished_threads(self):
+        """Drop jobs and workers whose completion signals were never delivered.
+        
+        Cleanup normally happens from task_done and finished(); this is only
+        scheduled as a fallback after a worker had to be terminated.
+        """
         dead_threads = []
         
-        for name, thread in self.active_threads.items():
-            if thread.isFinished() and not thread.isRunning():
-                dead_threads.append(name)
+        for shard in self._shards:
+            with QMutexLocker(shard.mutex):
+                for name, task in shard.threads.items():
+                    if task.worker is not None and task.worker.isFinished():
+                        dead_threads.append(name)
         
         for name in dead_threads:
             self._cleanup_thread(name)
+        
+        self._workers = [worker for worker in self._workers if not worker.isFinished()]
+        self._ensure_workers()
@@ -9,9 +9,53 @@ import logging
 import subprocess
 import ast
 import re
+import json
+import io
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+# Metadata cache written next to the tools; bump the version when the
+# ToolInfo fields change so stale entries are ignored
+_TOOL_CACHE_NAME = ".tool_cache.json"
+_TOOL_CACHE_VERSION = 1
+
+# Module-level metadata assignments (__version__ = "...", etc.), matched on raw bytes
+_VAR_RE = re.compile(rb'__(version|author|description)__\s*=\s*["\']([^"\']+)["\']')
+
+# Requirement and category detection, matched case-insensitively on the raw
+# bytes (all keywords are ASCII, so the file is never decoded for this)
+_GUI_RE = re.compile(rb'pyside6|pyqt5|pyqt6|tkinter|kivy', re.IGNORECASE)
+_ADMIN_RE = re.compile(rb'winreg|ctypes.windll|os.system|subprocess.*runas', re.IGNORECASE)
+_CATEGORY_RE = re.compile(rb'gpu|nvidia|cuda|network|socket|system|psutil|gaming|game', re.IGNORECASE)
+
+# Keyword -> (priority, category); lower priority wins when several match
+_CATEGORY_KEYWORDS = {
+    b'gpu': (0, "GPU/Graphics"), b'nvidia': (0, "GPU/Graphics"), b'cuda': (0, "GPU/Graphics"),
+    b'network': (1, "Network"), b'socket': (1, "Network"),
+    b'system': (2, "System"), b'psutil': (2, "System"),
+    b'game': (3, "Gaming"), b'gaming': (3, "Gaming"),
+}
+
+# Worker threads used to parse changed scripts
+_DISCOVERY_WORKERS = min(8, os.cpu_count() or 4)
+
+# Only the first lines are searched for "# Key: value" comments, and only
+# this many leading bytes are decoded to find them
+_COMMENT_SCAN_LINES = 50
+_HEADER_BYTES = 8192
+
+# A module docstring: the first statement, after any BOM, blank lines and
+# comments, is a string literal (any quote style)
+_DOCSTRING_START_RE = re.compile(rb'(?:\xef\xbb\xbf)?(?:[ \t\f]*(?:#[^\n]*)?\r?\n)*[ \t\f]*[rRuU]?["\']')
+
+# "# Key: value" header comments and "Key: value" docstring lines
+_COMMENT_META_RE = re.compile(
+    r'^\s*#\s*(?P<k>description|author|version|category)\s*:(?P<v>.*)$', re.IGNORECASE)
+_DOC_META_RE = re.compile(
+    r'^\s*(?P<k>description|author|version|category|requires admin)\s*:(?P<v>.*)$', re.IGNORECASE)
+
 
 class ToolInfo:
     """Information about a tool/script."""
@@ -30,47 +74,54 @@ class ToolInfo:
         # Parse script for metadata
         self._parse_script_metadata()
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ToolInfo':
+        """Rebuild a ToolInfo from to_dict() output without re-reading the script."""
+        tool = cls.__new__(cls)
+        tool.__dict__.update(data)
+        return tool
+    
     def _parse_script_metadata(self):
         """Parse the script file to extract metadata."""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
+            with open(self.file_path, 'rb') as f:
                 content = f.read()
             
-            # Look for common metadata patterns
-            self._extract_from_comments(content)
-            self._extract_from_docstrings(content)
-            self._extract_from_variables(content)
+            # Variables are applied after the docstring so they still win
+            variables = self._scan_source(content)
+            if _DOCSTRING_START_RE.match(content):
+                self._extract_from_docstrings(content)
+            for attr, value in variables.items():
+                setattr(self, attr, value)
             self._detect_requirements(content)
             
         except Exception as e:
             logging.warning(f"Failed to parse metadata for {self.filename}: {e}")
     
-    def _extract_from_comments(self, content: str):
-        """Extract metadata from comments."""
-        lines = content.split('\n')
-        
-        for line in lines[:50]:  # Check first 50 lines
-            line = line.strip()
-            if line.startswith('#'):
-                # Remove # and clean
-                comment = line[1:].strip()
-                
-                # Look for patterns
-                if comment.lower().startswith('description:'):
-                    self.description = comment[12:].strip()
-                elif comment.lower().startswith('author:'):
-                    self.author = comment[7:].strip()
-                elif comment.lower().startswith('version:'):
-                    self.version = comment[8:].strip()
-                elif comment.lower().startswith('category:'):
-                    self.category = comment[9:].strip()
-                elif 'admin' in comment.lower() and 'require' in comment.lower():
+    def _scan_source(self, content: bytes) -> Dict[str, str]:
+        """Read header comments in place and return module-level metadata variables."""
+        # Only the header is decoded and split into lines
+        header = content[:_HEADER_BYTES].decode('utf-8-sig', errors='ignore')
+        for line in islice(io.StringIO(header), _COMMENT_SCAN_LINES):
+            match = _COMMENT_META_RE.match(line)
+            if match:
+                setattr(self, match.group('k').lower(), match.group('v').strip())
+            elif line.lstrip().startswith('#'):
+                comment_lower = line.lower()
+                if 'admin' in comment_lower and 'require' in comment_lower:
                     self.requires_admin = True
+        
+        # First assignment of each variable wins
+        variables = {}
+        for match in _VAR_RE.finditer(content):
+            variables.setdefault(match.group(1).decode(), match.group(2).decode('utf-8', errors='replace'))
+        return variables
     
-    def _extract_from_docstrings(self, content: str):
+    def _extract_from_docstrings(self, content: bytes):
         """Extract metadata from module docstring."""
         try:
-            # Try to parse the AST to get the module docstring
+            # Try to parse the AST to get the module docstring (ast handles
+            # the BOM and coding declaration when given bytes)
             tree = ast.parse(content)
             docstring = ast.get_docstring(tree)
             
@@ -92,65 +143,37 @@ class ToolInfo:
                 
                 # Look for metadata in docstring
                 for line in lines:
-                    line_lower = line.strip().lower()
-                    line_original = line.strip()
-                    
-                    if line_lower.startswith('author:'):
-                        self.author = line_original.split(':', 1)[1].strip()
-                    elif line_lower.startswith('version:'):
-                        self.version = line_original.split(':', 1)[1].strip()
-                    elif line_lower.startswith('category:'):
-                        self.category = line_original.split(':', 1)[1].strip()
-                    elif line_lower.startswith('description:'):
-                        self.description = line_original.split(':', 1)[1].strip()
-                    elif line_lower.startswith('requires admin:'):
-                        admin_text = line_original.split(':', 1)[1].strip().lower()
-                        self.requires_admin = admin_text in ['true', 'yes', '1']
+                    match = _DOC_META_RE.match(line)
+                    if not match:
+                        continue
+                    key = match.group('k').lower()
+                    value = match.group('v').strip()
+                    if key == 'requires admin':
+                        self.requires_admin = value.lower() in ['true', 'yes', '1']
+                    else:
+                        setattr(self, key, value)
                         
         except Exception:
             pass
     
-    def _extract_from_variables(self, content: str):
-        """Extract metadata from module-level variables."""
-        # Look for common variable patterns
-        patterns = {
-            'version': r'__version__\s*=\s*["\']([^"\']+)["\']',
-            'author': r'__author__\s*=\s*["\']([^"\']+)["\']',
-            'description': r'__description__\s*=\s*["\']([^"\']+)["\']',
-        }
-        
-        for attr, pattern in patterns.items():
-            match = re.search(pattern, content)
-            if match:
-                value = match.group(1)
-                if attr == 'version' and value:
-                    self.version = value
-                elif attr == 'author' and value:
-                    self.author = value
-                elif attr == 'description' and value:
-                    self.description = value
-    
-    def _detect_requirements(self, content: str):
+    def _detect_requirements(self, content: bytes):
         """Detect what the script requires."""
-        content_lower = content.lower()
-        
         # Check for GUI frameworks
-        gui_frameworks = ['pyside6', 'pyqt5', 'pyqt6', 'tkinter', 'kivy']
-        self.requires_gui = any(framework in content_lower for framework in gui_frameworks)
+        self.requires_gui = _GUI_RE.search(content) is not None
         
         # Check for admin requirements (common patterns)
-        admin_patterns = ['winreg', 'ctypes.windll', 'os.system', 'subprocess.*runas']
-        self.requires_admin = any(re.search(pattern, content_lower) for pattern in admin_patterns)
+        self.requires_admin = _ADMIN_RE.search(content) is not None
         
         # Detect category based on content
-        if 'gpu' in content_lower or 'nvidia' in content_lower or 'cuda' in content_lower:
-            self.category = "GPU/Graphics"
-        elif 'network' in content_lower or 'socket' in content_lower:
-            self.category = "Network"
-        elif 'system' in content_lower or 'psutil' in content_lower:
-            self.category = "System"
-        elif 'game' in content_lower or 'gaming' in content_lower:
-            self.category = "Gaming"
+        best = None
+        for match in _CATEGORY_RE.finditer(content):
+            keyword = _CATEGORY_KEYWORDS[match.group().lower()]
+            if best is None or keyword < best:
+                best = keyword
+                if best[0] == 0:
+                    break
+        if best is not None:
+            self.category = best[1]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for display."""
@@ -178,6 +201,10 @@ class ToolManager:
         # Ensure tools directory exists
         self.tools_directory.mkdir(exist_ok=True)
         
+        # Parsed metadata by absolute path, validated by mtime and size
+        self.cache_file = self.tools_directory / _TOOL_CACHE_NAME
+        self._cache: Dict[str, Dict[str, Any]] = self._load_cache()
+        
         # Discover tools
         self.discover_tools()
     
@@ -189,20 +216,87 @@ class ToolManager:
             self.logger.warning(f"Tools directory does not exist: {self.tools_directory}")
             return
         
-        # Find all Python scripts
-        python_files = list(self.tools_directory.glob("*.py"))
+        # Find all Python scripts (one directory read, one stat per file);
+        # private helpers such as __init__.py are not tools
+        with os.scandir(self.tools_directory) as it:
+            python_files = [entry for entry in it
+                            if entry.name.endswith(".py") and
+                            not entry.name.startswith("_") and
+                            entry.is_file()]
         
-        for file_path in python_files:
+        fresh_cache = {}
+        stale = []
+        for entry in python_files:
             try:
-                tool_info = ToolInfo(str(file_path))
-                self.tools[tool_info.name] = tool_info
-                self.logger.debug(f"Discovered tool: {tool_info.name}")
-                
-            except Exception as e:
-                self.logger.error(f"Failed to load tool {file_path}: {e}")
+                stat = entry.stat()
+            except OSError as e:
+                self.logger.error(f"Failed to load tool {entry.path}: {e}")
+                continue
+            
+            key = os.path.abspath(entry.path)
+            cached = self._cache.get(key)
+            if (cached and
+                    cached["mtime_ns"] == stat.st_mtime_ns and
+                    cached["size"] == stat.st_size):
+                fresh_cache[key] = cached
+                self._add_tool(ToolInfo.from_dict(cached["data"]))
+            else:
+                stale.append((key, entry.path, stat))
+        
+        # Changed scripts are read and parsed independently, so do it in parallel
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(_DISCOVERY_WORKERS, len(stale))) as executor:
+                infos = executor.map(self._load_tool, (path for _key, path, _stat in stale))
+                for (key, _path, stat), tool_info in zip(stale, infos):
+                    if tool_info is None:
+                        continue
+                    fresh_cache[key] = {
+                        "mtime_ns": stat.st_mtime_ns,
+                        "size": stat.st_size,
+                        "data": tool_info.to_dict()
+                    }
+                    self._add_tool(tool_info)
+        
+        if fresh_cache != self._cache:
+            self._cache = fresh_cache
+            self._save_cache()
         
         self.logger.info(f"Discovered {len(self.tools)} tools")
     
+    def _load_tool(self, file_path: str) -> Optional[ToolInfo]:
+        """Parse one script, returning None if it cannot be loaded."""
+        try:
+            return ToolInfo(file_path)
+        except Exception as e:
+            self.logger.error(f"Failed to load tool {file_path}: {e}")
+            return None
+    
+    def _add_tool(self, tool_info: ToolInfo) -> None:
+        """Register a discovered tool."""
+        self.tools[tool_info.name] = tool_info
+        self.logger.debug(f"Discovered tool: {tool_info.name}")
+    
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load the metadata cache ({path: {mtime_ns, size, data}})."""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as file:
+                cache = json.load(file)
+            if cache.get("version") == _TOOL_CACHE_VERSION:
+                return cache.get("files", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {}
+    
+    def _save_cache(self) -> None:
+        """Write the metadata cache atomically."""
+        tmp_path = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump({"version": _TOOL_CACHE_VERSION, "files": self._cache}, file, indent=2)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            self.logger.warning(f"Failed to write tool cache: {e}")
+    
     def get_tools(self) -> Dict[str, ToolInfo]:
         """Get all discovered tools."""
         return self.tools.copy()
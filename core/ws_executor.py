@@ -0,0 +1,169 @@
+"""
+Work-Stealing Executor
+concurrent.futures executor with one deque per worker instead of a single shared queue.
+"""
+
+import os
+import random
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Callable, List, Optional
+
+# Empty local-pop/steal rounds a worker makes before going to sleep
+_STEAL_ROUNDS = 4
+
+
+class WorkStealingExecutor(Executor):
+    """Thread pool where each worker owns a deque and idle workers steal.
+
+    Tasks submitted from inside a worker go onto that worker's own deque;
+    external submitters are spread round-robin. Owners pop from the right
+    (newest first), thieves take from the left (oldest first), and a worker
+    only blocks on the shared condition after several empty steal rounds.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, thread_name_prefix: str = "ws_worker"):
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._deques = [deque() for _ in range(max_workers)]
+        self._locks = [threading.Lock() for _ in range(max_workers)]
+        self._local = threading.local()
+        self._round_robin = itertools.count()
+
+        # Sleeping workers wait here; submitters only touch it when someone sleeps
+        self._idle = threading.Condition()
+        self._sleepers = 0
+
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        """Schedule fn(*args, **kwargs) and return its Future."""
+        if self._shutdown:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        if not self._threads:
+            self._start_workers()
+
+        future = Future()
+        index = getattr(self._local, "index", None)
+        if index is None:
+            index = next(self._round_robin) % self._max_workers
+
+        with self._locks[index]:
+            self._deques[index].append((future, fn, args, kwargs))
+
+        if self._sleepers:
+            with self._idle:
+                self._idle.notify()
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop accepting work; optionally drop queued tasks and join the workers."""
+        with self._idle:
+            self._shutdown = True
+            self._idle.notify_all()
+
+        if cancel_futures:
+            self._cancel_queued()
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
+            # Anything that raced in after the workers left will never run
+            self._cancel_queued()
+
+    def _start_workers(self) -> None:
+        """Spawn the worker threads on first use."""
+        with self._start_lock:
+            if self._threads:
+                return
+            threads = []
+            for index in range(self._max_workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index,),
+                    name=f"{self._thread_name_prefix}_{index}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+            self._threads = threads
+
+    def _cancel_queued(self) -> None:
+        """Cancel every task still sitting in a deque."""
+        for lock, tasks in zip(self._locks, self._deques):
+            with lock:
+                pending = list(tasks)
+                tasks.clear()
+            for future, _fn, _args, _kwargs in pending:
+                future.cancel()
+
+    def _has_work(self) -> bool:
+        return any(self._deques)
+
+    def _pop_local(self, index: int):
+        with self._locks[index]:
+            tasks = self._deques[index]
+            return tasks.pop() if tasks else None
+
+    def _steal(self, index: int):
+        """Take the oldest task from another worker, starting at a random victim."""
+        count = self._max_workers
+        start = random.randrange(count)
+        for offset in range(count):
+            victim = (start + offset) % count
+            if victim == index:
+                continue
+            with self._locks[victim]:
+                tasks = self._deques[victim]
+                if tasks:
+                    return tasks.popleft()
+        return None
+
+    def _worker(self, index: int) -> None:
+        self._local.index = index
+        misses = 0
+
+        while True:
+            task = self._pop_local(index) or self._steal(index)
+            if task is not None:
+                misses = 0
+                self._run(task)
+                continue
+
+            misses += 1
+            if misses < _STEAL_ROUNDS:
+                continue
+
+            with self._idle:
+                # Re-check under the lock: a submitter that saw no sleepers
+                # pushed before this point, so its task is visible here
+                self._sleepers += 1
+                try:
+                    while not self._shutdown and not self._has_work():
+                        self._idle.wait()
+                finally:
+                    self._sleepers -= 1
+                if self._shutdown and not self._has_work():
+                    return
+            misses = 0
+
+    @staticmethod
+    def _run(task) -> None:
+        future, fn, args, kwargs = task
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
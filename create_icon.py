@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
 Create app icon
+The PNG is committed under assets/icons; run with --force to re-render it.
 """
 import sys
 from pathlib import Path
@@ -9,12 +10,18 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QPixmap, QPainter, QColor, QFont, QPen, QBrush
+from PySide6.QtGui import QGuiApplication, QPixmap, QPainter, QColor, QFont, QPen, QBrush
 from PySide6.QtCore import Qt
 
-def create_icon():
-    app = QApplication([])
+ICON_PATH = project_root / "assets" / "icons" / "app_icon.png"
+
+def create_icon(force: bool = False):
+    if ICON_PATH.exists() and not force:
+        print(f'Icon already exists at: {ICON_PATH} (use --force to re-render)')
+        return
+    
+    # Painting a pixmap only needs the GUI module, not QtWidgets
+    app = QGuiApplication.instance() or QGuiApplication([])
     
     # Create a proper PNG icon
     size = 64
@@ -42,10 +49,9 @@ def create_icon():
     painter.end()
 
     # Save icon
-    icon_path = project_root / "assets" / "icons" / "app_icon.png"
-    icon_path.parent.mkdir(parents=True, exist_ok=True)
-    pixmap.save(str(icon_path), 'PNG')
-    print(f'Icon created at: {icon_path}')
+    ICON_PATH.parent.mkdir(parents=True, exist_ok=True)
+    pixmap.save(str(ICON_PATH), 'PNG')
+    print(f'Icon created at: {ICON_PATH}')
 
 if __name__ == "__main__":
-    create_icon()
+    create_icon(force="--force" in sys.argv[1:])
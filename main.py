@@ -14,7 +14,7 @@ import sys
 import os
 from pathlib import Path
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt, QDir
+from PySide6.QtCore import Qt, QDir, QTimer
 from PySide6.QtGui import QIcon
 
 # Add the project root to Python path
@@ -23,6 +23,13 @@ sys.path.insert(0, str(project_root))
 
 from core.app_core import GamingHelperApp
 
+APP_ICON_PATH = project_root / "assets" / "icons" / "app_icon.png"
+
+def apply_window_icon(app):
+    """Set the application icon if the asset is present."""
+    if APP_ICON_PATH.exists():
+        app.setWindowIcon(QIcon(str(APP_ICON_PATH)))
+
 def setup_application():
     """Setup the main QApplication with necessary configurations."""
     # Enable high DPI scaling - Qt6 way
@@ -34,10 +41,9 @@ def setup_application():
     app.setOrganizationName("Party Brasil")
     app.setOrganizationDomain("partybrasil.dev")
     
-    # Set application icon if available
-    icon_path = project_root / "assets" / "icons" / "app_icon.png"
-    if icon_path.exists():
-        app.setWindowIcon(QIcon(str(icon_path)))
+    # Set application icon once the event loop runs, keeping the file
+    # check and PNG decode off the path to the first frame
+    QTimer.singleShot(0, lambda: apply_window_icon(app))
     
     return app
 
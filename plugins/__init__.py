@@ -0,0 +1,4 @@
+"""
+Gaming Helper Plugins
+Plugin modules are discovered and imported by core.plugin_manager.
+"""
@@ -2,24 +2,230 @@
 Anti-AFK Plugin
 Prevents AFK kicks by simulating mouse and keyboard inputs automatically.
 """
+import os
+import re
 import time
 import random
 import logging
-import win32api
+import ctypes
+from ctypes import wintypes
+from functools import lru_cache
 import win32con
-import win32gui
-import win32process
-import psutil
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                               QLabel, QComboBox, QSpinBox, QGroupBox, QCheckBox,
                               QSlider, QTabWidget, QFormLayout, QLineEdit,
                               QListWidget, QListWidgetItem, QTextEdit)
-from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtCore import Qt, QTimer, QMetaObject, Q_ARG, Signal, Slot
 from PySide6.QtGui import QFont, QColor
 
 from core.plugin_manager import BasePlugin
 from ui.floating_panel import FloatingPanel
 
+# SendInput structures (see winuser.h); built once at import
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_SCANCODE = 0x0008
+MOUSEEVENTF_MOVE = 0x0001
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+MAPVK_VK_TO_VSC = 0
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+VK_SPACE = win32con.VK_SPACE
+VK_SHIFT = win32con.VK_SHIFT
+VK_CONTROL = win32con.VK_CONTROL
+VK_MENU = win32con.VK_MENU
+VK_TAB = win32con.VK_TAB
+VK_ESCAPE = win32con.VK_ESCAPE
+
+# Game detection is driven by foreground-change events; polling remains only
+# as a slow safety net (or at the old rate if the hook cannot be installed)
+_GAME_POLL_MS = 2000
+_GAME_POLL_FALLBACK_MS = 30000
+
+# Anti-AFK key names -> virtual key codes
+_KEY_MAP = {
+    'space': VK_SPACE,
+    'w': ord('W'),
+    'a': ord('A'),
+    's': ord('S'),
+    'd': ord('D'),
+    'shift': VK_SHIFT,
+    'ctrl': VK_CONTROL,
+    'alt': VK_MENU,
+    'tab': VK_TAB,
+    'escape': VK_ESCAPE,
+}
+_KEY_NAMES = {vk: name for name, vk in _KEY_MAP.items()}
+
+# Common game indicators in window titles / process names
+_GAME_INDICATORS_RE = re.compile('|'.join(map(re.escape, [
+    'steam', 'epic', 'origin', 'uplay', 'battle.net', 'gog',
+    'minecraft', 'roblox', 'unity', 'unreal', 'gamemode',
+    '.exe', 'game', 'online', 'multiplayer', 'fps', 'mmo'
+])))
+
+# Input this soon after our own injection is treated as ours, not the user's
+_OWN_INPUT_SLACK_MS = 50
+
+# Window titles longer than this are truncated
+_TITLE_BUFFER_CHARS = 512
+
+# AntiAFKConfigWidget waits this long after the last edit before saving
+_SETTINGS_SAVE_DEBOUNCE_MS = 250
+
+# Thread manager task name for the input worker
+_SIMULATION_TASK = "anti_afk_simulation"
+
+# Safe mode moves the mouse back after this delay
+_MOUSE_RETURN_DELAY_MS = 100
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", wintypes.LONG),
+                ("dy", wintypes.LONG),
+                ("mouseData", wintypes.DWORD),
+                ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", wintypes.WORD),
+                ("wScan", wintypes.WORD),
+                ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class _HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [("uMsg", wintypes.DWORD),
+                ("wParamL", wintypes.WORD),
+                ("wParamH", wintypes.WORD)]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", _MOUSEINPUT),
+                ("ki", _KEYBDINPUT),
+                ("hi", _HARDWAREINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _anonymous_ = ("u",)
+    _fields_ = [("type", wintypes.DWORD),
+                ("u", _INPUTUNION)]
+
+
+class _LASTINPUTINFO(ctypes.Structure):
+    _fields_ = [("cbSize", wintypes.UINT),
+                ("dwTime", wintypes.DWORD)]
+
+
+_user32 = ctypes.WinDLL("user32", use_last_error=True)
+_user32.SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(_INPUT), ctypes.c_int)
+_user32.SendInput.restype = wintypes.UINT
+_user32.MapVirtualKeyW.argtypes = (wintypes.UINT, wintypes.UINT)
+_user32.MapVirtualKeyW.restype = wintypes.UINT
+_user32.GetWindowTextW.argtypes = (wintypes.HWND, wintypes.LPWSTR, ctypes.c_int)
+_user32.GetWindowTextW.restype = ctypes.c_int
+_user32.GetLastInputInfo.argtypes = (ctypes.POINTER(_LASTINPUTINFO),)
+_user32.GetLastInputInfo.restype = wintypes.BOOL
+_user32.GetForegroundWindow.argtypes = ()
+_user32.GetForegroundWindow.restype = wintypes.HWND
+_user32.GetWindowThreadProcessId.argtypes = (wintypes.HWND, ctypes.POINTER(wintypes.DWORD))
+_user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+
+_WinEventProc = ctypes.WINFUNCTYPE(
+    None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+    wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+)
+_user32.SetWinEventHook.argtypes = (
+    wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, _WinEventProc,
+    wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+)
+_user32.SetWinEventHook.restype = wintypes.HANDLE
+_user32.UnhookWinEvent.argtypes = (wintypes.HANDLE,)
+_user32.UnhookWinEvent.restype = wintypes.BOOL
+
+_kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+_kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+_kernel32.OpenProcess.restype = wintypes.HANDLE
+_kernel32.QueryFullProcessImageNameW.argtypes = (
+    wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR, ctypes.POINTER(wintypes.DWORD)
+)
+_kernel32.QueryFullProcessImageNameW.restype = wintypes.BOOL
+_kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+_kernel32.CloseHandle.restype = wintypes.BOOL
+_kernel32.GetTickCount.argtypes = ()
+_kernel32.GetTickCount.restype = wintypes.DWORD
+
+
+def _send_inputs(inputs) -> None:
+    """Inject an INPUT array with a single SendInput call."""
+    sent = _user32.SendInput(len(inputs), inputs, ctypes.sizeof(_INPUT))
+    if sent != len(inputs):
+        raise ctypes.WinError(ctypes.get_last_error())
+
+
+@lru_cache(maxsize=None)
+def _scan_code(vk_code: int) -> int:
+    """Hardware scan code for a virtual key (cached, the mapping never changes)."""
+    return _user32.MapVirtualKeyW(vk_code, MAPVK_VK_TO_VSC)
+
+
+def _tap_key(vk_code: int) -> None:
+    """Press and release a key as scan codes in one SendInput call.
+    
+    Scan-code input is what DirectInput/raw-input games read, and sending
+    down+up together avoids blocking the GUI thread for a hold delay.
+    """
+    scan = _scan_code(vk_code)
+    inputs = (_INPUT * 2)()
+    inputs[0].type = inputs[1].type = INPUT_KEYBOARD
+    inputs[0].ki.wScan = inputs[1].ki.wScan = scan
+    inputs[0].ki.dwFlags = KEYEVENTF_SCANCODE
+    inputs[1].ki.dwFlags = KEYEVENTF_SCANCODE | KEYEVENTF_KEYUP
+    _send_inputs(inputs)
+
+
+def _fast_process_name(pid: int) -> str:
+    """Lowercase executable name from a single limited-rights process handle."""
+    handle = _kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        buf = ctypes.create_unicode_buffer(wintypes.MAX_PATH)
+        size = wintypes.DWORD(wintypes.MAX_PATH)
+        if not _kernel32.QueryFullProcessImageNameW(handle, 0, buf, ctypes.byref(size)):
+            raise ctypes.WinError(ctypes.get_last_error())
+    finally:
+        _kernel32.CloseHandle(handle)
+    return os.path.basename(buf.value).lower()
+
+
+def _last_input_tick() -> int:
+    """GetTickCount() value of the most recent system-wide keyboard/mouse input."""
+    info = _LASTINPUTINFO()
+    info.cbSize = ctypes.sizeof(info)
+    if not _user32.GetLastInputInfo(ctypes.byref(info)):
+        raise ctypes.WinError(ctypes.get_last_error())
+    return info.dwTime
+
+
+def _tick_delta(a: int, b: int) -> int:
+    """Signed a - b for 32-bit GetTickCount() values, correct across the wrap."""
+    return ((a - b + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+
+
+def _nudge_mouse(dx: int, dy: int) -> None:
+    """Move the mouse by a relative offset, as a real mouse would report it."""
+    inputs = (_INPUT * 1)()
+    inputs[0].type = INPUT_MOUSE
+    inputs[0].mi.dx = dx
+    inputs[0].mi.dy = dy
+    inputs[0].mi.dwFlags = MOUSEEVENTF_MOVE
+    _send_inputs(inputs)
+
 
 class AntiAFKPlugin(BasePlugin):
     """Anti-AFK Plugin to prevent being kicked for inactivity."""
@@ -30,6 +236,9 @@ class AntiAFKPlugin(BasePlugin):
     version = "1.0.0"
     author = "Party Brasil"
     
+    # Emitted whenever Anti-AFK starts or stops
+    active_changed = Signal(bool)
+    
     def __init__(self, config_manager, thread_manager):
         super().__init__(config_manager, thread_manager)
         
@@ -40,15 +249,34 @@ class AntiAFKPlugin(BasePlugin):
         # AFK prevention state
         self.is_anti_afk_active = False
         self.current_game_window = None
-        self.last_input_time = time.time()
+        self._own_input_window = (0, 0)  # Ticks before/after our last injected input
+        self._rng = random.Random()  # Own generator for intervals and inputs
         
-        # Timers
+        # Timers (precise, so intervals are not quantized to the coarse tick)
         self.afk_timer = QTimer()
+        self.afk_timer.setTimerType(Qt.PreciseTimer)
+        self.afk_timer.setSingleShot(True)  # Re-armed with a random interval
         self.afk_timer.timeout.connect(self._execute_anti_afk_action)
+        self._last_action_time = time.monotonic()
+        
+        # Publishes the next-action countdown, only while Anti-AFK is active
+        self.countdown_timer = QTimer()
+        self.countdown_timer.setInterval(1000)
+        self.countdown_timer.timeout.connect(self._emit_countdown)
         
         self.game_detection_timer = QTimer()
+        self.game_detection_timer.setTimerType(Qt.PreciseTimer)
+        self.game_detection_timer.setInterval(_GAME_POLL_MS)  # Check every 2 seconds
         self.game_detection_timer.timeout.connect(self._detect_active_game)
-        self.game_detection_timer.start(2000)  # Check every 2 seconds
+        self.game_detection_timer.start()
+        
+        # Foreground-change hook (installed in initialize) and its callback,
+        # which must stay referenced while the hook is live
+        self._foreground_hook = None
+        self._foreground_proc = None
+        
+        # Reused for every foreground-window title lookup
+        self._title_buf = ctypes.create_unicode_buffer(_TITLE_BUFFER_CHARS)
         
         # Default configuration
         default_config = {
@@ -72,6 +300,38 @@ class AntiAFKPlugin(BasePlugin):
         for key, value in default_config.items():
             if key not in self.plugin_config:
                 self.plugin_config[key] = value
+        
+        self._apply_config()
+    
+    def _apply_config(self):
+        """Snapshot the settings read on every action into plain attributes.
+        
+        Called at creation and from apply_config, which every settings UI
+        goes through, so the hot paths never look up plugin_config.
+        """
+        config = self.plugin_config
+        self._cfg_enabled = config.get('enabled', True)
+        self._cfg_min = config.get('interval_min', 30)
+        self._cfg_max = config.get('interval_max', 60)
+        self._cfg_mouse = config.get('mouse_enabled', True)
+        self._cfg_keyboard = config.get('keyboard_enabled', True)
+        self._cfg_mouse_range = config.get('mouse_movement_range', 10)
+        self._cfg_keys_vk = tuple(_KEY_MAP.get(key.lower(), VK_SPACE)
+                                  for key in config.get('keyboard_keys', ['space']))
+        self._cfg_only_games = config.get('only_in_games', True)
+        self._cfg_smart = config.get('smart_detection', True)
+        self._cfg_safe = config.get('safe_mode', True)
+        self._cfg_action_type = config.get('action_type', 'random')
+        self._cfg_threshold = config.get('last_activity_threshold', 30)
+        
+        # Whitelist/blacklist as one case-insensitive regex each
+        def compile_terms(terms):
+            if not terms:
+                return None
+            return re.compile('|'.join(re.escape(term.lower()) for term in terms))
+        
+        self._whitelist_re = compile_terms(config.get('game_whitelist', []))
+        self._blacklist_re = compile_terms(config.get('game_blacklist', []))
     
     def initialize(self) -> bool:
         """Initialize the Anti-AFK plugin."""
@@ -88,6 +348,11 @@ class AntiAFKPlugin(BasePlugin):
             self.anti_afk_widget.toggle_requested.connect(self._toggle_anti_afk)
             self.anti_afk_widget.config_changed.connect(self._on_config_changed)
             
+            # Get told about foreground changes instead of polling for them
+            if self._install_foreground_hook():
+                self.game_detection_timer.setInterval(_GAME_POLL_FALLBACK_MS)
+            self._detect_active_game()
+            
             self.logger.info("Anti-AFK plugin initialized successfully")
             return super().initialize()
             
@@ -133,9 +398,13 @@ class AntiAFKPlugin(BasePlugin):
             if self.afk_timer:
                 self.afk_timer.stop()
             
+            self.countdown_timer.stop()
+            
             if self.game_detection_timer:
                 self.game_detection_timer.stop()
             
+            self._remove_foreground_hook()
+            
             return super().shutdown()
             
         except Exception as e:
@@ -160,26 +429,24 @@ class AntiAFKPlugin(BasePlugin):
     def _start_anti_afk(self):
         """Start Anti-AFK functionality."""
         try:
-            if not self.plugin_config.get('enabled', True):
+            if not self._cfg_enabled:
                 self.status_changed.emit("Anti-AFK is disabled in settings")
                 return
             
             # Check if we should only work in games
-            if self.plugin_config.get('only_in_games', True):
+            if self._cfg_only_games:
                 if not self._is_game_active():
                     self.status_changed.emit("No game detected - Anti-AFK not started")
                     return
             
             self.is_anti_afk_active = True
-            self.last_input_time = time.time()
             
             # Calculate random interval
-            min_interval = self.plugin_config.get('interval_min', 30)
-            max_interval = self.plugin_config.get('interval_max', 60)
-            interval = random.randint(min_interval, max_interval) * 1000  # Convert to ms
-            
-            self.afk_timer.start(interval)
+            self._last_action_time = time.monotonic()
+            interval = self._arm_afk_timer()
             
+            self.countdown_timer.start()
+            self.active_changed.emit(True)
             self.status_changed.emit("Anti-AFK started")
             self.data_updated.emit({"status": "active", "next_action_in": interval // 1000})
             
@@ -188,13 +455,20 @@ class AntiAFKPlugin(BasePlugin):
     
     def _stop_anti_afk(self):
         """Stop Anti-AFK functionality."""
+        was_active = self.is_anti_afk_active
         self.is_anti_afk_active = False
         self.afk_timer.stop()
+        self.countdown_timer.stop()
+        if was_active:
+            self.active_changed.emit(False)
         self.status_changed.emit("Anti-AFK stopped")
         self.data_updated.emit({"status": "inactive"})
     
     def _execute_anti_afk_action(self):
         """Execute an anti-AFK action."""
+        # The next interval counts from when this one fired, not from when
+        # the action finished, so processing time does not add drift
+        self._last_action_time = time.monotonic()
         try:
             # Check if user has been active recently
             if self._is_user_recently_active():
@@ -203,17 +477,17 @@ class AntiAFKPlugin(BasePlugin):
                 return
             
             # Check if game is still active (if required)
-            if self.plugin_config.get('only_in_games', True):
+            if self._cfg_only_games:
                 if not self._is_game_active():
                     self.status_changed.emit("Game no longer active - stopping Anti-AFK")
                     self._stop_anti_afk()
                     return
             
             # Determine action type
-            action_type = self.plugin_config.get('action_type', 'random')
+            action_type = self._cfg_action_type
             
             if action_type == 'random':
-                action = random.choice(['mouse', 'keyboard'])
+                action = self._rng.choice(('mouse', 'keyboard'))
             elif action_type == 'mouse_only':
                 action = 'mouse'
             elif action_type == 'keyboard_only':
@@ -221,13 +495,12 @@ class AntiAFKPlugin(BasePlugin):
             else:
                 action = 'mouse'  # Default fallback
             
-            # Execute the action
-            if action == 'mouse' and self.plugin_config.get('mouse_enabled', True):
+            # Execute the action (the input itself is sent on a worker thread)
+            if action == 'mouse' and self._cfg_mouse:
                 self._simulate_mouse_movement()
-            elif action == 'keyboard' and self.plugin_config.get('keyboard_enabled', True):
+            elif action == 'keyboard' and self._cfg_keyboard:
                 self._simulate_key_press()
             
-            self.last_input_time = time.time()
             self._schedule_next_action()
             
         except Exception as e:
@@ -236,172 +509,233 @@ class AntiAFKPlugin(BasePlugin):
     
     def _simulate_mouse_movement(self):
         """Simulate small mouse movement."""
-        try:
-            # Get current cursor position
-            current_pos = win32gui.GetCursorPos()
-            
-            # Calculate small random movement
-            movement_range = self.plugin_config.get('mouse_movement_range', 10)
-            dx = random.randint(-movement_range, movement_range)
-            dy = random.randint(-movement_range, movement_range)
-            
-            # Apply safe mode constraints
-            if self.plugin_config.get('safe_mode', True):
-                dx = max(-5, min(5, dx))  # Limit to ±5 pixels
-                dy = max(-5, min(5, dy))
-            
-            new_x = current_pos[0] + dx
-            new_y = current_pos[1] + dy
-            
-            # Move cursor
-            win32api.SetCursorPos((new_x, new_y))
-            
-            # Optional: Move back to original position after a short delay
-            if self.plugin_config.get('safe_mode', True):
-                time.sleep(0.1)
-                win32api.SetCursorPos(current_pos)
-            
-            self.status_changed.emit(f"Mouse moved by ({dx}, {dy})")
-            
-        except Exception as e:
-            self.error_occurred.emit(f"Failed to simulate mouse movement: {e}")
+        # Calculate small random movement
+        movement_range = self._cfg_mouse_range
+        dx = self._rng.randrange(-movement_range, movement_range + 1)
+        dy = self._rng.randrange(-movement_range, movement_range + 1)
+        
+        # Apply safe mode constraints
+        safe_mode = self._cfg_safe
+        if safe_mode:
+            dx = max(-5, min(5, dx))  # Limit to ±5 pixels
+            dy = max(-5, min(5, dy))
+        
+        self._dispatch_simulation(self._mouse_worker, dx, dy, safe_mode)
     
     def _simulate_key_press(self):
         """Simulate a key press."""
+        keys = self._cfg_keys_vk
+        if not keys:
+            return
+        
+        # Choose random key (names were mapped to VK codes in _apply_config)
+        self._dispatch_simulation(self._key_worker, self._rng.choice(keys))
+    
+    def _dispatch_simulation(self, worker, *args):
+        """Run an input worker on the thread manager so SendInput never blocks the GUI."""
+        if not self.thread_manager.start_task(_SIMULATION_TASK, worker, *args):
+            self.status_changed.emit("Previous action still running - skipping")
+    
+    def _mouse_worker(self, dx, dy, safe_mode):
+        """Worker thread: move the mouse, and back again in safe mode."""
+        started = _kernel32.GetTickCount()
         try:
-            keys = self.plugin_config.get('keyboard_keys', ['space'])
-            if not keys:
-                return
-            
-            # Choose random key
-            key = random.choice(keys)
-            
-            # Map key names to virtual key codes
-            key_map = {
-                'space': win32con.VK_SPACE,
-                'w': ord('W'),
-                'a': ord('A'),
-                's': ord('S'),
-                'd': ord('D'),
-                'shift': win32con.VK_SHIFT,
-                'ctrl': win32con.VK_CONTROL,
-                'alt': win32con.VK_MENU,
-                'tab': win32con.VK_TAB,
-                'escape': win32con.VK_ESCAPE,
-            }
-            
-            vk_code = key_map.get(key.lower(), win32con.VK_SPACE)
-            
-            # Send key press
-            win32api.keybd_event(vk_code, 0, 0, 0)  # Key down
-            time.sleep(0.05)  # Brief hold
-            win32api.keybd_event(vk_code, 0, win32con.KEYEVENTF_KEYUP, 0)  # Key up
-            
-            self.status_changed.emit(f"Key pressed: {key}")
-            
+            # Move relative to the current position
+            _nudge_mouse(dx, dy)
+            if safe_mode:
+                time.sleep(_MOUSE_RETURN_DELAY_MS / 1000)
+                _nudge_mouse(-dx, -dy)
+            self._post_simulation_result(f"Mouse moved by ({dx}, {dy})", False)
         except Exception as e:
-            self.error_occurred.emit(f"Failed to simulate key press: {e}")
+            self._post_simulation_result(f"Failed to simulate mouse movement: {e}", True)
+        finally:
+            self._own_input_window = (started, _kernel32.GetTickCount())
+    
+    def _key_worker(self, vk_code):
+        """Worker thread: send a key press (down + up)."""
+        started = _kernel32.GetTickCount()
+        try:
+            _tap_key(vk_code)
+            self._post_simulation_result(f"Key pressed: {_KEY_NAMES[vk_code]}", False)
+        except Exception as e:
+            self._post_simulation_result(f"Failed to simulate key press: {e}", True)
+        finally:
+            self._own_input_window = (started, _kernel32.GetTickCount())
+    
+    def _post_simulation_result(self, message, failed):
+        """Hand a worker's outcome to the GUI thread, where the signals are emitted."""
+        QMetaObject.invokeMethod(self, "_on_simulation_result", Qt.QueuedConnection,
+                                 Q_ARG(str, message), Q_ARG(bool, failed))
+    
+    @Slot(str, bool)
+    def _on_simulation_result(self, message, failed):
+        """Report the outcome of an input worker."""
+        if failed:
+            self.error_occurred.emit(message)
+        else:
+            self.status_changed.emit(message)
     
     def _schedule_next_action(self):
         """Schedule the next Anti-AFK action."""
         if self.is_anti_afk_active:
-            min_interval = self.plugin_config.get('interval_min', 30)
-            max_interval = self.plugin_config.get('interval_max', 60)
-            interval = random.randint(min_interval, max_interval) * 1000
-            
-            self.afk_timer.start(interval)
+            interval = self._arm_afk_timer()
             self.data_updated.emit({"next_action_in": interval // 1000})
     
+    @Slot()
+    def _emit_countdown(self):
+        """Report the seconds left until the next action."""
+        if self.afk_timer.isActive():
+            seconds = (self.afk_timer.remainingTime() + 999) // 1000
+            self.data_updated.emit({"next_action_in": seconds})
+    
+    def _arm_afk_timer(self) -> int:
+        """Start the single-shot AFK timer for a random interval after the last action.
+        
+        Returns the milliseconds until the timer fires.
+        """
+        min_interval = self._cfg_min
+        max_interval = self._cfg_max
+        interval = self._rng.randrange(min_interval, max_interval + 1) * 1000  # Convert to ms
+        
+        elapsed = int((time.monotonic() - self._last_action_time) * 1000)
+        remaining = max(0, interval - elapsed)
+        self.afk_timer.start(remaining)
+        return remaining
+    
+    def _install_foreground_hook(self) -> bool:
+        """Subscribe to EVENT_SYSTEM_FOREGROUND on the GUI thread's message loop."""
+        try:
+            self._foreground_proc = _WinEventProc(self._on_foreground_event)
+            self._foreground_hook = _user32.SetWinEventHook(
+                EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, None,
+                self._foreground_proc, 0, 0, WINEVENT_OUTOFCONTEXT
+            )
+        except Exception as e:
+            self.logger.warning("Foreground hook unavailable, polling instead: %s", e)
+            self._foreground_hook = None
+        
+        if not self._foreground_hook:
+            self._foreground_proc = None
+            return False
+        return True
+    
+    def _remove_foreground_hook(self):
+        """Unsubscribe from foreground-change events."""
+        if self._foreground_hook:
+            _user32.UnhookWinEvent(self._foreground_hook)
+        self._foreground_hook = None
+        self._foreground_proc = None
+    
+    def _on_foreground_event(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        """WinEvent callback: the foreground window changed."""
+        try:
+            self._update_current_window(hwnd)
+        except Exception:
+            pass  # Never let an exception escape into the Windows callback
+    
     def _detect_active_game(self):
         """Detect if a game is currently active."""
         try:
-            hwnd = win32gui.GetForegroundWindow()
-            if hwnd:
-                window_title = win32gui.GetWindowText(hwnd)
-                _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                
-                try:
-                    process = psutil.Process(pid)
-                    process_name = process.name().lower()
-                    
-                    # Update current game info
-                    self.current_game_window = {
-                        'title': window_title,
-                        'process': process_name,
-                        'pid': pid,
-                        'hwnd': hwnd
-                    }
-                    
-                    self.data_updated.emit({"current_window": window_title, "process": process_name})
-                    
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    self.current_game_window = None
-            
+            self._update_current_window(_user32.GetForegroundWindow())
         except Exception as e:
             pass  # Silent fail for game detection
     
+    def _update_current_window(self, hwnd):
+        """Record the window and process that now have the foreground."""
+        if not hwnd:
+            return
+        
+        _user32.GetWindowTextW(hwnd, self._title_buf, _TITLE_BUFFER_CHARS)
+        window_title = self._title_buf.value
+        
+        # Same window means same process; only the title can have changed
+        current = self.current_game_window
+        if current and current['hwnd'] == hwnd:
+            if current['title'] != window_title:
+                current['title'] = window_title
+                current['title_lc'] = window_title.lower()
+                self.data_updated.emit({"current_window": window_title, "process": current['process']})
+            return
+        
+        try:
+            pid_out = wintypes.DWORD()
+            if not _user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid_out)):
+                raise ctypes.WinError(ctypes.get_last_error())
+            pid = pid_out.value
+            process_name = _fast_process_name(pid)
+            
+            # Update current game info
+            self.current_game_window = {
+                'title': window_title,
+                'title_lc': window_title.lower(),
+                'process': process_name,
+                'process_lc': process_name.lower(),
+                'pid': pid,
+                'hwnd': hwnd
+            }
+            
+            self.data_updated.emit({"current_window": window_title, "process": process_name})
+            
+        except OSError:
+            self.current_game_window = None
+    
     def _is_game_active(self):
         """Check if a game is currently active."""
         if not self.current_game_window:
             return False
         
+        # Lowercased when the window was recorded; the filters use lowercased terms
+        window = self.current_game_window
+        combined = f"{window['process_lc']}\n{window['title_lc']}"
+        
         # Check whitelist
-        whitelist = self.plugin_config.get('game_whitelist', [])
-        if whitelist:
-            process_name = self.current_game_window.get('process', '').lower()
-            title = self.current_game_window.get('title', '').lower()
-            
-            for game in whitelist:
-                if game.lower() in process_name or game.lower() in title:
-                    return True
-            return False
+        if self._whitelist_re is not None:
+            return self._whitelist_re.search(combined) is not None
         
         # Check blacklist
-        blacklist = self.plugin_config.get('game_blacklist', [])
-        if blacklist:
-            process_name = self.current_game_window.get('process', '').lower()
-            title = self.current_game_window.get('title', '').lower()
-            
-            for game in blacklist:
-                if game.lower() in process_name or game.lower() in title:
-                    return False
+        if self._blacklist_re is not None and self._blacklist_re.search(combined):
+            return False
         
         # Basic game detection heuristics
-        if self.plugin_config.get('smart_detection', True):
-            window_title = self.current_game_window.get('title', '').lower()
-            process_name = self.current_game_window.get('process', '').lower()
-            
-            # Common game indicators
-            game_indicators = [
-                'steam', 'epic', 'origin', 'uplay', 'battle.net', 'gog',
-                'minecraft', 'roblox', 'unity', 'unreal', 'gamemode',
-                '.exe', 'game', 'online', 'multiplayer', 'fps', 'mmo'
-            ]
-            
-            # Check if it's likely a game
-            for indicator in game_indicators:
-                if indicator in window_title or indicator in process_name:
-                    return True
+        if self._cfg_smart:
+            if _GAME_INDICATORS_RE.search(combined):
+                return True
         
         return True  # Default to true if no specific filtering
     
     def _is_user_recently_active(self):
         """Check if user has been active recently."""
-        if not self.plugin_config.get('smart_detection', True):
+        if not self._cfg_smart:
             return False
         
-        threshold = self.plugin_config.get('last_activity_threshold', 30)
-        time_since_last_action = time.time() - self.last_input_time
+        # Tick counts are 32-bit and wrap after ~49 days; compare wrap-aware.
+        # The injected event may be stamped anywhere between the ticks taken
+        # before and after SendInput, so accept the whole window.
+        last_input = _last_input_tick()
+        started, finished = self._own_input_window
+        if (_tick_delta(last_input, started) >= -_OWN_INPUT_SLACK_MS
+                and _tick_delta(last_input, finished) <= _OWN_INPUT_SLACK_MS):
+            return False  # The most recent input was one we injected
         
-        return time_since_last_action < threshold
+        idle_ms = (_kernel32.GetTickCount() - last_input) & 0xFFFFFFFF
+        return idle_ms < self._cfg_threshold * 1000
+    
+    def apply_config(self):
+        """Apply and save edited settings without restarting the AFK countdown.
+        
+        New intervals take effect when the next action is scheduled.
+        """
+        self._apply_config()
+        self.save_config()
     
     def _on_config_changed(self):
         """Handle configuration changes."""
-        self.save_config()
+        self.apply_config()
         
         # Restart timer if active with new intervals
         if self.is_anti_afk_active:
             self.afk_timer.stop()
+            self._last_action_time = time.monotonic()
             self._schedule_next_action()
 
 
@@ -411,17 +745,64 @@ class AntiAFKWidget(QWidget):
     toggle_requested = Signal()
     config_changed = Signal()
     
+    STATUS_ACTIVE_STYLE = """
+        QLabel {
+            font-size: 16px;
+            font-weight: bold;
+            padding: 10px;
+            border: 2px solid #27ae60;
+            border-radius: 5px;
+            background: rgba(39, 174, 96, 50);
+            color: #27ae60;
+        }
+    """
+    STATUS_INACTIVE_STYLE = """
+        QLabel {
+            font-size: 16px;
+            font-weight: bold;
+            padding: 10px;
+            border: 2px solid #555;
+            border-radius: 5px;
+            background: rgba(50, 50, 50, 100);
+            color: #bdc3c7;
+        }
+    """
+    TOGGLE_STOP_STYLE = """
+        QPushButton {
+            font-size: 14px;
+            font-weight: bold;
+            padding: 10px;
+            border: none;
+            border-radius: 5px;
+            background: #e74c3c;
+            color: white;
+        }
+        QPushButton:hover {
+            background: #c0392b;
+        }
+    """
+    TOGGLE_START_STYLE = """
+        QPushButton {
+            font-size: 14px;
+            font-weight: bold;
+            padding: 10px;
+            border: none;
+            border-radius: 5px;
+            background: #27ae60;
+            color: white;
+        }
+        QPushButton:hover {
+            background: #2ecc71;
+        }
+    """
+    
     def __init__(self, plugin):
         super().__init__()
         self.plugin = plugin
+        self._last_ui_state = None  # Last is_anti_afk_active shown
         self._setup_ui()
         self._connect_signals()
         self._update_display()
-        
-        # Update timer
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self._update_display)
-        self.update_timer.start(1000)  # Update every second
     
     def _setup_ui(self):
         """Setup the Anti-AFK widget UI."""
@@ -554,77 +935,37 @@ class AntiAFKWidget(QWidget):
         self.safe_mode_cb.toggled.connect(self._on_settings_changed)
         self.advanced_btn.clicked.connect(self._show_advanced_settings)
         
-        # Plugin signals
+        # Plugin signals (the display is only refreshed when these fire)
         self.plugin.status_changed.connect(self._on_status_changed)
         self.plugin.data_updated.connect(self._on_data_updated)
+        self.plugin.active_changed.connect(self._update_display)
     
     def _update_display(self):
         """Update the display with current information."""
-        # Update status
-        if self.plugin.is_anti_afk_active:
-            self.status_label.setText("🟢 ACTIVE")
-            self.status_label.setStyleSheet("""
-                QLabel {
-                    font-size: 16px;
-                    font-weight: bold;
-                    padding: 10px;
-                    border: 2px solid #27ae60;
-                    border-radius: 5px;
-                    background: rgba(39, 174, 96, 50);
-                    color: #27ae60;
-                }
-            """)
-            self.toggle_btn.setText("Stop Anti-AFK")
-            self.toggle_btn.setStyleSheet("""
-                QPushButton {
-                    font-size: 14px;
-                    font-weight: bold;
-                    padding: 10px;
-                    border: none;
-                    border-radius: 5px;
-                    background: #e74c3c;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background: #c0392b;
-                }
-            """)
-        else:
-            self.status_label.setText("🔴 INACTIVE")
-            self.status_label.setStyleSheet("""
-                QLabel {
-                    font-size: 16px;
-                    font-weight: bold;
-                    padding: 10px;
-                    border: 2px solid #555;
-                    border-radius: 5px;
-                    background: rgba(50, 50, 50, 100);
-                    color: #bdc3c7;
-                }
-            """)
-            self.toggle_btn.setText("Start Anti-AFK")
-            self.toggle_btn.setStyleSheet("""
-                QPushButton {
-                    font-size: 14px;
-                    font-weight: bold;
-                    padding: 10px;
-                    border: none;
-                    border-radius: 5px;
-                    background: #27ae60;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background: #2ecc71;
-                }
-            """)
+        # Update status (stylesheets are only re-applied on a state change)
+        active = self.plugin.is_anti_afk_active
+        if active != self._last_ui_state:
+            self._last_ui_state = active
+            if active:
+                self.status_label.setText("🟢 ACTIVE")
+                self.status_label.setStyleSheet(self.STATUS_ACTIVE_STYLE)
+                self.toggle_btn.setText("Stop Anti-AFK")
+                self.toggle_btn.setStyleSheet(self.TOGGLE_STOP_STYLE)
+            else:
+                self.status_label.setText("🔴 INACTIVE")
+                self.status_label.setStyleSheet(self.STATUS_INACTIVE_STYLE)
+                self.toggle_btn.setText("Start Anti-AFK")
+                self.toggle_btn.setStyleSheet(self.TOGGLE_START_STYLE)
+                self.next_action_label.clear()
         
         # Update game detection
         if self.plugin.current_game_window:
             title = self.plugin.current_game_window.get('title', 'Unknown')
-            process = self.plugin.current_game_window.get('process', 'unknown')
-            self.game_label.setText(f"🎮 {title[:30]}{'...' if len(title) > 30 else ''}")
+            game_text = f"🎮 {title[:30]}{'...' if len(title) > 30 else ''}"
         else:
-            self.game_label.setText("No game detected")
+            game_text = "No game detected"
+        if game_text != self.game_label.text():
+            self.game_label.setText(game_text)
     
     def _on_status_changed(self, message):
         """Handle status change signals."""
@@ -676,6 +1017,13 @@ class AntiAFKConfigWidget(QWidget):
     def __init__(self, plugin):
         super().__init__()
         self.plugin = plugin
+        
+        # Bursts of edits (e.g. dragging a spin box) collapse into one save
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(_SETTINGS_SAVE_DEBOUNCE_MS)
+        self._save_timer.timeout.connect(self._flush_save)
+        
         self._setup_ui()
         self._load_settings()
         self._connect_signals()
@@ -746,29 +1094,43 @@ class AntiAFKConfigWidget(QWidget):
     
     def _connect_signals(self):
         """Connect setting change signals."""
-        self.enabled_cb.toggled.connect(self._save_settings)
-        self.interval_min_spin.valueChanged.connect(self._save_settings)
-        self.interval_max_spin.valueChanged.connect(self._save_settings)
-        self.mouse_enabled_cb.toggled.connect(self._save_settings)
-        self.keyboard_enabled_cb.toggled.connect(self._save_settings)
-        self.safe_mode_cb.toggled.connect(self._save_settings)
-        self.only_games_cb.toggled.connect(self._save_settings)
-        self.smart_detection_cb.toggled.connect(self._save_settings)
-    
-    def _save_settings(self):
+        self.enabled_cb.toggled.connect(self._queue_save)
+        self.interval_min_spin.valueChanged.connect(self._queue_save)
+        self.interval_max_spin.valueChanged.connect(self._queue_save)
+        self.mouse_enabled_cb.toggled.connect(self._queue_save)
+        self.keyboard_enabled_cb.toggled.connect(self._queue_save)
+        self.safe_mode_cb.toggled.connect(self._queue_save)
+        self.only_games_cb.toggled.connect(self._queue_save)
+        self.smart_detection_cb.toggled.connect(self._queue_save)
+    
+    @Slot()
+    def _queue_save(self):
+        """Schedule a save; restarts the debounce window on every change."""
+        self._save_timer.start()
+    
+    def hideEvent(self, event):
+        """Save a pending edit now; the timer would die with a closed panel."""
+        if self._save_timer.isActive():
+            self._flush_save()
+        super().hideEvent(event)
+    
+    @Slot()
+    def _flush_save(self):
         """Save settings to plugin configuration."""
-        self.plugin.plugin_config['enabled'] = self.enabled_cb.isChecked()
-        self.plugin.plugin_config['interval_min'] = self.interval_min_spin.value()
-        self.plugin.plugin_config['interval_max'] = self.interval_max_spin.value()
-        self.plugin.plugin_config['mouse_enabled'] = self.mouse_enabled_cb.isChecked()
-        self.plugin.plugin_config['keyboard_enabled'] = self.keyboard_enabled_cb.isChecked()
-        self.plugin.plugin_config['safe_mode'] = self.safe_mode_cb.isChecked()
-        self.plugin.plugin_config['only_in_games'] = self.only_games_cb.isChecked()
-        self.plugin.plugin_config['smart_detection'] = self.smart_detection_cb.isChecked()
-        
-        # Validate intervals
+        # Validate intervals (setValue re-queues a save; it is cancelled below)
         if self.interval_min_spin.value() > self.interval_max_spin.value():
             self.interval_max_spin.setValue(self.interval_min_spin.value())
-            self.plugin.plugin_config['interval_max'] = self.interval_min_spin.value()
+        self._save_timer.stop()
+        
+        self.plugin.plugin_config.update({
+            'enabled': self.enabled_cb.isChecked(),
+            'interval_min': self.interval_min_spin.value(),
+            'interval_max': self.interval_max_spin.value(),
+            'mouse_enabled': self.mouse_enabled_cb.isChecked(),
+            'keyboard_enabled': self.keyboard_enabled_cb.isChecked(),
+            'safe_mode': self.safe_mode_cb.isChecked(),
+            'only_in_games': self.only_games_cb.isChecked(),
+            'smart_detection': self.smart_detection_cb.isChecked(),
+        })
         
-        self.plugin.save_config()
+        self.plugin.apply_config()
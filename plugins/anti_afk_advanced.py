@@ -2,17 +2,65 @@
 Advanced Anti-AFK Configuration Dialog
 Provides advanced settings for the Anti-AFK plugin.
 """
+from itertools import product
+
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTabWidget,
                               QWidget, QGroupBox, QFormLayout, QLineEdit,
                               QListWidget, QPushButton, QLabel, QSpinBox,
                               QCheckBox, QComboBox, QTextEdit, QSlider,
-                              QDialogButtonBox, QMessageBox, QListWidgetItem)
-from PySide6.QtCore import Qt
+                              QDialogButtonBox, QMessageBox, QListWidgetItem,
+                              QGridLayout)
+from PySide6.QtCore import Qt, QTimer, QSignalBlocker, Slot
+
+# Apply clicks within this window collapse into one config change
+_SAVE_DEBOUNCE_MS = 250
+
+# Tab order; only the keyboard tab is built before the dialog is shown
+_KEYBOARD_TAB, _MOUSE_TAB, _GAMES_TAB, _ADVANCED_TAB = range(4)
+_TAB_TITLES = ("Keyboard", "Mouse", "Games", "Advanced")
+
+# Keys offered as checkboxes on the keyboard tab, in grid order
+_AVAILABLE_KEYS = (
+    'space', 'w', 'a', 's', 'd', 'shift', 'ctrl', 'alt',
+    'tab', 'escape', 'enter', 'f1', 'f2', 'f3', 'f4',
+    '1', '2', '3', '4', '5', 'q', 'e', 'r', 't', 'y'
+)
+_KEY_GRID_COLUMNS = 5
+_KEY_GRID_ROWS = -(-len(_AVAILABLE_KEYS) // _KEY_GRID_COLUMNS)
+
+# click_type config values, in click type combo box order
+_IDX_TO_CLICK = ("left", "right", "middle")
+_CLICK_TO_IDX = {click: index for index, click in enumerate(_IDX_TO_CLICK)}
 
 
 class AntiAFKAdvancedDialog(QDialog):
     """Advanced configuration dialog for Anti-AFK plugin."""
     
+    # Plain widget-backed settings per tab:
+    # (config key, widget attribute, getter, setter, default)
+    _FIELDS = {
+        _KEYBOARD_TAB: (
+            ('key_hold_time', 'key_hold_time', 'value', 'setValue', 50),
+            ('key_sequence_enabled', 'key_sequence_enabled', 'isChecked', 'setChecked', False),
+        ),
+        _MOUSE_TAB: (
+            ('mouse_movement_range', 'mouse_range_slider', 'value', 'setValue', 10),
+            ('mouse_return_enabled', 'mouse_return_enabled', 'isChecked', 'setChecked', True),
+            ('mouse_return_delay', 'mouse_return_delay', 'value', 'setValue', 100),
+            ('mouse_clicks_enabled', 'mouse_clicks_enabled', 'isChecked', 'setChecked', False),
+            ('click_probability', 'click_probability', 'value', 'setValue', 10),
+        ),
+        _GAMES_TAB: (),
+        _ADVANCED_TAB: (
+            ('last_activity_threshold', 'activity_threshold', 'value', 'setValue', 30),
+            ('window_check_interval', 'window_check_interval', 'value', 'setValue', 2),
+            ('max_actions_per_minute', 'max_actions_per_minute', 'value', 'setValue', 5),
+            ('emergency_stop_enabled', 'emergency_stop_enabled', 'isChecked', 'setChecked', True),
+            ('log_actions', 'log_actions', 'isChecked', 'setChecked', False),
+            ('detailed_logging', 'detailed_logging', 'isChecked', 'setChecked', False),
+        ),
+    }
+    
     def __init__(self, plugin, parent=None):
         super().__init__(parent)
         self.plugin = plugin
@@ -21,9 +69,17 @@ class AntiAFKAdvancedDialog(QDialog):
         self.setModal(True)
         self.resize(500, 600)
         
+        # Applied settings are handed to the plugin after a short delay;
+        # closing the dialog flushes anything still pending
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(_SAVE_DEBOUNCE_MS)
+        self._save_timer.timeout.connect(self.plugin.apply_config)
+        
         self._setup_ui()
-        self._load_settings()
-        self._connect_signals()
+        
+        # What the plugin already has; saving an identical dialog is a no-op
+        self._last_saved_config = self._collect_settings()
     
     def _setup_ui(self):
         """Setup the advanced settings UI."""
@@ -33,11 +89,16 @@ class AntiAFKAdvancedDialog(QDialog):
         self.tab_widget = QTabWidget()
         layout.addWidget(self.tab_widget)
         
-        # Tabs
-        self._create_keyboard_tab()
-        self._create_mouse_tab()
-        self._create_games_tab()
-        self._create_advanced_tab()
+        # Tabs start as empty pages and are filled in on first activation
+        self._tab_builders = (
+            self._create_keyboard_tab, self._create_mouse_tab,
+            self._create_games_tab, self._create_advanced_tab
+        )
+        self._tab_built = set()
+        for title in _TAB_TITLES:
+            self.tab_widget.addTab(QWidget(), title)
+        self._ensure_tab_built(_KEYBOARD_TAB)
+        self.tab_widget.currentChanged.connect(self._ensure_tab_built)
         
         # Button box
         button_box = QDialogButtonBox(
@@ -48,36 +109,26 @@ class AntiAFKAdvancedDialog(QDialog):
         button_box.button(QDialogButtonBox.Apply).clicked.connect(self._apply_settings)
         layout.addWidget(button_box)
     
-    def _create_keyboard_tab(self):
+    def _create_keyboard_tab(self, tab):
         """Create keyboard settings tab."""
-        tab = QWidget()
         layout = QVBoxLayout(tab)
         
         # Key selection
         keys_group = QGroupBox("Key Configuration")
         keys_layout = QVBoxLayout(keys_group)
         
-        # Available keys
-        available_keys = [
-            'space', 'w', 'a', 's', 'd', 'shift', 'ctrl', 'alt',
-            'tab', 'escape', 'enter', 'f1', 'f2', 'f3', 'f4',
-            '1', '2', '3', '4', '5', 'q', 'e', 'r', 't', 'y'
-        ]
-        
         keys_layout.addWidget(QLabel("Select keys to use for Anti-AFK:"))
         
-        # Key checkboxes in a grid
-        from PySide6.QtWidgets import QGridLayout
-        keys_grid = QGridLayout()
-        self.key_checkboxes = {}
+        # Key checkboxes in a grid (set on its widget up front, so each
+        # checkbox is parented once instead of reparented by setLayout)
+        keys_widget = QWidget()
+        keys_grid = QGridLayout(keys_widget)
+        self.key_checkboxes = {key: QCheckBox(key.upper()) for key in _AVAILABLE_KEYS}
         
-        for i, key in enumerate(available_keys):
-            checkbox = QCheckBox(key.upper())
-            self.key_checkboxes[key] = checkbox
-            keys_grid.addWidget(checkbox, i // 5, i % 5)
+        positions = product(range(_KEY_GRID_ROWS), range(_KEY_GRID_COLUMNS))
+        for checkbox, (row, column) in zip(self.key_checkboxes.values(), positions):
+            keys_grid.addWidget(checkbox, row, column)
         
-        keys_widget = QWidget()
-        keys_widget.setLayout(keys_grid)
         keys_layout.addWidget(keys_widget)
         
         # Custom key input
@@ -107,12 +158,9 @@ class AntiAFKAdvancedDialog(QDialog):
         press_layout.addRow(self.key_sequence_enabled)
         
         layout.addWidget(press_group)
-        
-        self.tab_widget.addTab(tab, "Keyboard")
     
-    def _create_mouse_tab(self):
+    def _create_mouse_tab(self, tab):
         """Create mouse settings tab."""
-        tab = QWidget()
         layout = QVBoxLayout(tab)
         
         # Movement settings
@@ -122,6 +170,7 @@ class AntiAFKAdvancedDialog(QDialog):
         self.mouse_range_slider = QSlider(Qt.Horizontal)
         self.mouse_range_slider.setRange(1, 50)
         self.mouse_range_label = QLabel("10 pixels")
+        self.mouse_range_slider.valueChanged.connect(self._on_mouse_range_changed)
         movement_layout.addRow("Movement range:", self.mouse_range_slider)
         movement_layout.addRow("", self.mouse_range_label)
         
@@ -149,16 +198,14 @@ class AntiAFKAdvancedDialog(QDialog):
         self.click_probability = QSlider(Qt.Horizontal)
         self.click_probability.setRange(0, 100)
         self.click_probability_label = QLabel("10%")
+        self.click_probability.valueChanged.connect(self._on_click_probability_changed)
         click_layout.addRow("Click probability:", self.click_probability)
         click_layout.addRow("", self.click_probability_label)
         
         layout.addWidget(click_group)
-        
-        self.tab_widget.addTab(tab, "Mouse")
     
-    def _create_games_tab(self):
+    def _create_games_tab(self, tab):
         """Create games configuration tab."""
-        tab = QWidget()
         layout = QVBoxLayout(tab)
         
         # Game whitelist
@@ -167,6 +214,10 @@ class AntiAFKAdvancedDialog(QDialog):
         
         whitelist_layout.addWidget(QLabel("Anti-AFK will ONLY work with these games:"))
         
+        # Python lists mirror the list widgets, so saving never walks the items
+        self._whitelist = []
+        self._blacklist = []
+        
         self.whitelist_widget = QListWidget()
         whitelist_layout.addWidget(self.whitelist_widget)
         
@@ -210,12 +261,9 @@ class AntiAFKAdvancedDialog(QDialog):
         
         blacklist_layout.addLayout(blacklist_controls)
         layout.addWidget(blacklist_group)
-        
-        self.tab_widget.addTab(tab, "Games")
     
-    def _create_advanced_tab(self):
+    def _create_advanced_tab(self, tab):
         """Create advanced settings tab."""
-        tab = QWidget()
         layout = QVBoxLayout(tab)
         
         # Detection settings
@@ -264,57 +312,69 @@ class AntiAFKAdvancedDialog(QDialog):
         reset_btn.clicked.connect(self._reset_to_defaults)
         layout.addWidget(reset_btn)
         
-        self.tab_widget.addTab(tab, "Advanced")
-    
-    def _load_settings(self):
-        """Load current settings into the dialog."""
-        config = self.plugin.plugin_config
+        # Inline reset confirmation (no nested modal event loop)
+        self._reset_confirm_widget = QWidget()
+        confirm_layout = QHBoxLayout(self._reset_confirm_widget)
+        confirm_layout.setContentsMargins(0, 0, 0, 0)
+        confirm_layout.addWidget(QLabel("Reset all settings to defaults?"))
         
-        # Keyboard settings
-        selected_keys = config.get('keyboard_keys', ['space'])
-        for key, checkbox in self.key_checkboxes.items():
-            checkbox.setChecked(key in selected_keys)
-        
-        self.key_hold_time.setValue(config.get('key_hold_time', 50))
-        self.key_sequence_enabled.setChecked(config.get('key_sequence_enabled', False))
+        confirm_yes_btn = QPushButton("Yes")
+        confirm_yes_btn.clicked.connect(self._confirm_reset)
+        confirm_layout.addWidget(confirm_yes_btn)
         
-        # Mouse settings
-        self.mouse_range_slider.setValue(config.get('mouse_movement_range', 10))
-        self.mouse_range_label.setText(f"{config.get('mouse_movement_range', 10)} pixels")
-        self.mouse_return_enabled.setChecked(config.get('mouse_return_enabled', True))
-        self.mouse_return_delay.setValue(config.get('mouse_return_delay', 100))
-        
-        self.mouse_clicks_enabled.setChecked(config.get('mouse_clicks_enabled', False))
-        click_types = {"left": 0, "right": 1, "middle": 2}
-        self.click_type_combo.setCurrentIndex(click_types.get(config.get('click_type', 'left'), 0))
-        self.click_probability.setValue(config.get('click_probability', 10))
-        self.click_probability_label.setText(f"{config.get('click_probability', 10)}%")
-        
-        # Games settings
-        whitelist = config.get('game_whitelist', [])
-        for game in whitelist:
-            self.whitelist_widget.addItem(game)
-        
-        blacklist = config.get('game_blacklist', [])
-        for game in blacklist:
-            self.blacklist_widget.addItem(game)
+        confirm_no_btn = QPushButton("No")
+        confirm_no_btn.clicked.connect(self._reset_confirm_widget.hide)
+        confirm_layout.addWidget(confirm_no_btn)
         
-        # Advanced settings
-        self.activity_threshold.setValue(config.get('last_activity_threshold', 30))
-        self.window_check_interval.setValue(config.get('window_check_interval', 2))
-        self.max_actions_per_minute.setValue(config.get('max_actions_per_minute', 5))
-        self.emergency_stop_enabled.setChecked(config.get('emergency_stop_enabled', True))
-        self.log_actions.setChecked(config.get('log_actions', False))
-        self.detailed_logging.setChecked(config.get('detailed_logging', False))
+        self._reset_confirm_widget.setVisible(False)
+        layout.addWidget(self._reset_confirm_widget)
     
-    def _connect_signals(self):
-        """Connect widget signals."""
-        self.mouse_range_slider.valueChanged.connect(
-            lambda v: self.mouse_range_label.setText(f"{v} pixels")
-        )
-        self.click_probability.valueChanged.connect(
-            lambda v: self.click_probability_label.setText(f"{v}%")
-        )
+    def _ensure_tab_built(self, index):
+        """Build a tab's widgets and load its settings the first time it is needed."""
+        if index in self._tab_built or not 0 <= index < len(self._tab_builders):
+            return
+        self._tab_built.add(index)
+        self._tab_builders[index](self.tab_widget.widget(index))
+        self._load_settings(index)
+    
+    def _load_settings(self, index):
+        """Load current settings into one tab of the dialog."""
+        get = self.plugin.plugin_config.get
+        
+        # Spin boxes, sliders and check boxes; their change signals only feed
+        # the slider labels, which are refreshed once below
+        for key, attr, _getter, setter, default in self._FIELDS[index]:
+            widget = getattr(self, attr)
+            with QSignalBlocker(widget):
+                getattr(widget, setter)(get(key, default))
+        
+        if index == _KEYBOARD_TAB:
+            selected_keys = frozenset(get('keyboard_keys', ('space',)))
+            for key, checkbox in self.key_checkboxes.items():
+                checkbox.setChecked(key in selected_keys)
+        
+        elif index == _MOUSE_TAB:
+            self.click_type_combo.setCurrentIndex(_CLICK_TO_IDX.get(get('click_type', 'left'), 0))
+            self._update_slider_labels()
+        
+        elif index == _GAMES_TAB:
+            self._whitelist[:] = get('game_whitelist', [])
+            self._blacklist[:] = get('game_blacklist', [])
+            self.whitelist_widget.addItems(self._whitelist)
+            self.blacklist_widget.addItems(self._blacklist)
+    
+    def _update_slider_labels(self):
+        """Show the mouse tab's current slider values."""
+        self._on_mouse_range_changed(self.mouse_range_slider.value())
+        self._on_click_probability_changed(self.click_probability.value())
+    
+    @Slot(int)
+    def _on_mouse_range_changed(self, value):
+        self.mouse_range_label.setText(str(value) + " pixels")
+    
+    @Slot(int)
+    def _on_click_probability_changed(self, value):
+        self.click_probability_label.setText(str(value) + "%")
     
     def _add_custom_key(self):
         """Add a custom key to the list."""
@@ -329,6 +389,7 @@ class AntiAFKAdvancedDialog(QDialog):
         """Add a game to the whitelist."""
         game = self.whitelist_input.text().strip()
         if game:
+            self._whitelist.append(game)
             self.whitelist_widget.addItem(game)
             self.whitelist_input.clear()
     
@@ -336,12 +397,14 @@ class AntiAFKAdvancedDialog(QDialog):
         """Remove selected game from whitelist."""
         current_row = self.whitelist_widget.currentRow()
         if current_row >= 0:
+            del self._whitelist[current_row]
             self.whitelist_widget.takeItem(current_row)
     
     def _add_blacklist_game(self):
         """Add a game to the blacklist."""
         game = self.blacklist_input.text().strip()
         if game:
+            self._blacklist.append(game)
             self.blacklist_widget.addItem(game)
             self.blacklist_input.clear()
     
@@ -349,73 +412,117 @@ class AntiAFKAdvancedDialog(QDialog):
         """Remove selected game from blacklist."""
         current_row = self.blacklist_widget.currentRow()
         if current_row >= 0:
+            del self._blacklist[current_row]
             self.blacklist_widget.takeItem(current_row)
     
     def _reset_to_defaults(self):
+        """Ask for confirmation before resetting all settings to defaults."""
+        self._reset_confirm_widget.setVisible(True)
+    
+    def _confirm_reset(self):
         """Reset all settings to defaults."""
-        reply = QMessageBox.question(
-            self, "Reset Settings",
-            "Are you sure you want to reset all settings to defaults?",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
-        )
+        self._reset_confirm_widget.setVisible(False)
+        self._apply_defaults()
+    
+    def _apply_defaults(self):
+        """Put every tab's widgets back to the default values."""
+        for index in range(len(self._tab_builders)):
+            self._ensure_tab_built(index)
+        
+        # Spin boxes, sliders and check boxes, replayed from the field table
+        for fields in self._FIELDS.values():
+            for _key, attr, _getter, setter, default in fields:
+                widget = getattr(self, attr)
+                with QSignalBlocker(widget):
+                    getattr(widget, setter)(default)
         
-        if reply == QMessageBox.Yes:
-            # Reset to defaults (simplified)
+        # Keyboard settings
+        self.setUpdatesEnabled(False)
+        try:
             for checkbox in self.key_checkboxes.values():
                 checkbox.setChecked(False)
             self.key_checkboxes['space'].setChecked(True)
-            
-            self.mouse_range_slider.setValue(10)
-            self.activity_threshold.setValue(30)
-            # ... reset other values
+        finally:
+            self.setUpdatesEnabled(True)
+        
+        # Mouse settings
+        self.click_type_combo.setCurrentIndex(_CLICK_TO_IDX['left'])
+        self._update_slider_labels()
+        
+        # Games settings
+        self._whitelist.clear()
+        self._blacklist.clear()
+        self.whitelist_widget.clear()
+        self.blacklist_widget.clear()
     
     def _apply_settings(self):
         """Apply settings without closing dialog."""
         self._save_settings()
     
-    def _save_settings(self):
-        """Save settings to plugin configuration."""
-        config = self.plugin.plugin_config
+    def _collect_settings(self) -> dict:
+        """Read the dialog's widgets into a plugin config dict.
+        
+        Tabs that were never opened keep the plugin's current values.
+        """
+        get_current = self.plugin.plugin_config.get
+        built = self._tab_built
+        config = {}
+        
+        # Spin boxes, sliders and check boxes
+        for index, fields in self._FIELDS.items():
+            for key, attr, getter, _setter, default in fields:
+                if index in built:
+                    config[key] = getattr(getattr(self, attr), getter)()
+                else:
+                    config[key] = get_current(key, default)
         
         # Keyboard settings
         selected_keys = [key for key, checkbox in self.key_checkboxes.items() 
                         if checkbox.isChecked()]
         config['keyboard_keys'] = selected_keys if selected_keys else ['space']
-        config['key_hold_time'] = self.key_hold_time.value()
-        config['key_sequence_enabled'] = self.key_sequence_enabled.isChecked()
         
         # Mouse settings
-        config['mouse_movement_range'] = self.mouse_range_slider.value()
-        config['mouse_return_enabled'] = self.mouse_return_enabled.isChecked()
-        config['mouse_return_delay'] = self.mouse_return_delay.value()
-        config['mouse_clicks_enabled'] = self.mouse_clicks_enabled.isChecked()
-        
-        click_types = {0: "left", 1: "right", 2: "middle"}
-        config['click_type'] = click_types.get(self.click_type_combo.currentIndex(), "left")
-        config['click_probability'] = self.click_probability.value()
+        if _MOUSE_TAB in built:
+            config['click_type'] = _IDX_TO_CLICK[self.click_type_combo.currentIndex()]
+        else:
+            config['click_type'] = get_current('click_type', 'left')
         
         # Games settings
-        whitelist = [self.whitelist_widget.item(i).text() 
-                    for i in range(self.whitelist_widget.count())]
-        blacklist = [self.blacklist_widget.item(i).text() 
-                    for i in range(self.blacklist_widget.count())]
-        
-        config['game_whitelist'] = whitelist
-        config['game_blacklist'] = blacklist
-        
-        # Advanced settings
-        config['last_activity_threshold'] = self.activity_threshold.value()
-        config['window_check_interval'] = self.window_check_interval.value()
-        config['max_actions_per_minute'] = self.max_actions_per_minute.value()
-        config['emergency_stop_enabled'] = self.emergency_stop_enabled.isChecked()
-        config['log_actions'] = self.log_actions.isChecked()
-        config['detailed_logging'] = self.detailed_logging.isChecked()
-        
-        # Save to file
-        self.plugin.save_config()
+        if _GAMES_TAB in built:
+            whitelist, blacklist = self._whitelist, self._blacklist
+        else:
+            whitelist = get_current('game_whitelist', [])
+            blacklist = get_current('game_blacklist', [])
+        
+        config['game_whitelist'] = list(whitelist)
+        config['game_blacklist'] = list(blacklist)
+        
+        return config
+    
+    def _save_settings(self):
+        """Save settings to plugin configuration."""
+        config = self._collect_settings()
+        if config == self._last_saved_config:
+            return
+        
+        self.plugin.plugin_config.update(config)
+        self._last_saved_config = config
+        
+        # Apply and save to file once the clicks settle
+        self._save_timer.start()
+    
+    def _flush_save(self):
+        """Hand a pending save to the plugin immediately."""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self.plugin.apply_config()
     
     def accept(self):
         """Accept and save settings."""
         self._save_settings()
         super().accept()
+    
+    def done(self, result):
+        """Close the dialog (OK or Cancel) without losing an applied change."""
+        self._flush_save()
+        super().done(result)
@@ -478,6 +478,11 @@ class MultiHotkeyMacrosPlugin(BasePlugin):
             self.logger.error(f"Failed to deactivate Multi-Hotkey Macros plugin: {e}")
             return False
     
+    def shutdown_io(self) -> bool:
+        """Save macros before the UI teardown (may run on a worker thread)."""
+        self._save_macros()
+        return True
+    
     def shutdown(self) -> bool:
         """Shutdown the plugin."""
         try:
@@ -489,9 +494,6 @@ class MultiHotkeyMacrosPlugin(BasePlugin):
                 self.macro_executor.stop_execution()
                 self.macro_executor.wait(5000)
             
-            # Save macros
-            self._save_macros()
-            
             self.logger.info("Multi-Hotkey Macros plugin shutdown complete")
             return True
             
@@ -296,7 +296,8 @@ class TestCoreModules(unittest.TestCase):
             "core.config_manager", 
             "core.plugin_manager",
             "core.thread_manager",
-            "core.tool_manager"
+            "core.tool_manager",
+            "core.ws_executor"
         ]
         
         print_info(f"Verificando {len(core_modules)} módulos críticos del core...")
@@ -549,6 +550,149 @@ class TestConfiguration(unittest.TestCase):
             print_error(f"    ✗ Error al guardar/cargar configuración: {e}")
             self.fail(f"Error al guardar/cargar configuración: {e}")
 
+    def test_config_cache_invalidation(self):
+        """🔁 Verificar que set() invalida los valores cacheados por get()"""
+        self.config_manager.set("app.cache_probe", {"value": 1})
+        self.assertEqual(self.config_manager.get("app.cache_probe.value"), 1)
+
+        self.config_manager.set("app.cache_probe", {"value": 2})
+        self.assertEqual(self.config_manager.get("app.cache_probe.value"), 2)
+        self.assertEqual(self.config_manager.get("app.cache_probe.missing", "default"), "default")
+
+    def test_config_store_standalone(self):
+        """🗃️ Verificar que _ConfigStore funciona sin Qt y reporta cambios reales"""
+        from core.config_manager import _ConfigStore
+        store = _ConfigStore({"app": {"theme": "dark"}})
+        self.assertEqual(store.get("app.theme"), "dark")
+        self.assertFalse(store.set("app.theme", "dark"))
+        self.assertTrue(store.set("app.theme", "light"))
+        self.assertEqual(store.get("app.theme"), "light")
+        self.assertFalse(hasattr(store, "__dict__"))
+
+    def test_config_changed_coalesced(self):
+        """📡 Verificar que config_changed se emite una vez por clave con el último valor"""
+        if not QT_AVAILABLE:
+            self.skipTest("PySide6 no disponible")
+        emitted = []
+        self.config_manager.config_changed.connect(lambda key, value: emitted.append((key, value)))
+
+        for x in range(5):
+            self.config_manager.set("floating_icon.position.x", x + 1)
+        self.assertEqual(emitted, [])
+
+        QApplication.processEvents()
+        self.assertEqual(emitted, [("floating_icon.position.x", 5)])
+
+    def test_config_changed_from_worker_thread(self):
+        """📡 Verificar que set() desde un hilo sin bucle de eventos sigue emitiendo config_changed"""
+        if not QT_AVAILABLE:
+            self.skipTest("PySide6 no disponible")
+        import threading
+        emitted = []
+        self.config_manager.config_changed.connect(lambda key, value: emitted.append((key, value)))
+
+        for x in (11, 12):
+            worker = threading.Thread(target=self.config_manager.set, args=("floating_icon.position.x", x))
+            worker.start()
+            worker.join()
+            QApplication.processEvents()
+            self.assertEqual(emitted[-1:], [("floating_icon.position.x", x)])
+        self.assertTrue(self.config_manager._flush_timer.isActive())
+        self.config_manager._flush_timer.stop()
+
+    def test_config_save_debounce(self):
+        """⏱️ Verificar que save_config() agrupa escrituras y force=True escribe al instante"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.config_manager.config_file = Path(tmp_dir) / "config.yaml"
+
+            self.config_manager.set("app.debounce_probe", 1)
+            self.assertTrue(self.config_manager.save_config())
+            self.assertFalse(self.config_manager.config_file.exists())
+
+            self.assertTrue(self.config_manager.save_config(force=True))
+            self.assertTrue(self.config_manager.config_file.exists())
+
+    def test_config_save_skips_unchanged(self):
+        """📝 Verificar que save_config() no reescribe el archivo si nada cambió"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = Path(tmp_dir) / "config.yaml"
+            self.config_manager.config_file = config_file
+            self.config_manager.set("app.skip_probe", 1)
+            self.assertTrue(self.config_manager.save_config(force=True))
+
+            config_file.write_bytes(b"sentinel")
+            self.assertTrue(self.config_manager.save_config(force=True))
+            self.assertEqual(config_file.read_bytes(), b"sentinel")
+
+            self.config_manager.set("app.skip_probe", 2)
+            self.assertTrue(self.config_manager.save_config(force=True))
+            self.assertIn(b"skip_probe: 2", config_file.read_bytes())
+
+    def test_plugin_config_queue(self):
+        """🧺 Verificar que las configuraciones de plugins se agrupan hasta el flush"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.config_manager.plugins_config_dir = Path(tmp_dir)
+            plugin_file = Path(tmp_dir) / "queue_probe.yaml"
+
+            self.config_manager.queue_plugin_config("queue_probe", {"value": 1})
+            self.config_manager.queue_plugin_config("queue_probe", {"value": 2})
+            self.assertFalse(plugin_file.exists())
+            self.assertEqual(self.config_manager.get_plugin_config("queue_probe"), {"value": 2})
+
+            self.config_manager.flush_plugin_configs()
+            self.assertTrue(plugin_file.exists())
+            self.assertEqual(self.config_manager.get_plugin_config("queue_probe"), {"value": 2})
+
+    def test_plugin_config_background_write(self):
+        """🧵 Verificar que el flush diferido escribe los plugins en segundo plano"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.config_manager.plugins_config_dir = Path(tmp_dir)
+            plugin_file = Path(tmp_dir) / "async_probe.yaml"
+
+            config = {"value": 1}
+            self.config_manager.queue_plugin_config("async_probe", config)
+            self.config_manager._flush_plugin_configs_async()
+            config["value"] = 2  # Serialized before the write, so not persisted
+            self.assertEqual(self.config_manager.get_plugin_config("async_probe"), {"value": 1})
+
+            self.config_manager.flush_plugin_configs()
+            self.assertTrue(plugin_file.exists())
+            self.assertEqual(self.config_manager.get_plugin_config("async_probe"), {"value": 1})
+
+    def test_plugin_config_save_skips_unchanged(self):
+        """📝 Verificar que save_plugin_config() no reescribe un plugin sin cambios"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.config_manager.plugins_config_dir = Path(tmp_dir)
+            plugin_file = Path(tmp_dir) / "skip_probe.yaml"
+            self.assertTrue(self.config_manager.save_plugin_config("skip_probe", {"value": 1}))
+
+            plugin_file.write_bytes(b"sentinel")
+            self.assertTrue(self.config_manager.save_plugin_config("skip_probe", {"value": 1}))
+            self.assertEqual(plugin_file.read_bytes(), b"sentinel")
+
+            self.assertTrue(self.config_manager.save_plugin_config("skip_probe", {"value": 2}))
+            self.assertEqual(self.config_manager.get_plugin_config("skip_probe"), {"value": 2})
+
+    def test_forced_save_reports_failure(self):
+        """💾 Verificar que save_config(force=True) devuelve el resultado real y conserva los cambios pendientes"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.config_manager.config_file = Path(tmp_dir) / "missing" / "config.yaml"
+            self.config_manager.set("floating_icon.position.x", 321)
+            self.assertFalse(self.config_manager.save_config(force=True))
+
+            self.config_manager.config_file = Path(tmp_dir) / "config.yaml"
+            self.assertTrue(self.config_manager._flush())
+            self.assertIn("321", self.config_manager.config_file.read_text(encoding="utf-8"))
+
+    def test_config_defaults_not_aliased(self):
+        """🧬 Verificar que modificar la configuración no altera los valores por defecto"""
+        self.config_manager.reset_to_defaults()
+        self.config_manager.set("floating_icon.position.x", 999)
+
+        self.assertEqual(self.config_manager.default_config["floating_icon"]["position"]["x"], 100)
+        self.config_manager.reset_to_defaults()
+        self.assertEqual(self.config_manager.get("floating_icon.position.x"), 100)
+
 class TestPluginSystem(unittest.TestCase):
     """
     🔌 PRUEBAS DEL SISTEMA DE PLUGINS
@@ -589,6 +733,73 @@ class TestPluginSystem(unittest.TestCase):
             print_error(f"    ✗ Error al descubrir plugins: {e}")
             self.fail(f"Error al descubrir plugins: {e}")
     
+    def test_plugin_discovery_lazy(self):
+        """🗂️ Verificar que el descubrimiento no importe módulos y que la caché evite reanalizarlos"""
+        from core.plugin_manager import PluginManager
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.plugin_manager.plugin_cache_file = Path(tmp_dir) / "plugin_cache.json"
+            with patch("core.plugin_manager._import_plugin_module") as import_module:
+                first = self.plugin_manager.discover_plugins()
+            import_module.assert_not_called()
+            self.assertTrue(self.plugin_manager.plugin_cache_file.exists())
+
+            cached_manager = PluginManager(self.config_manager, self.thread_manager)
+            cached_manager.plugin_cache_file = self.plugin_manager.plugin_cache_file
+            with patch("core.plugin_manager._scan_metadata") as scan_metadata:
+                self.assertEqual(sorted(cached_manager.discover_plugins()), sorted(first))
+            # Solo se reanalizan los archivos que no quedaron en caché (dependencias faltantes)
+            rescanned = {str(call.args[0]) for call in scan_metadata.call_args_list}
+            cached_files = {cached_manager.available_plugins[name].module_file for name in first}
+            self.assertFalse(rescanned & cached_files)
+
+    def test_plugin_discovery_indirect_subclass(self):
+        """🧬 Verificar que se descubran plugins que heredan de BasePlugin a través de otra clase"""
+        from core.plugin_manager import _scan_metadata
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            base_file = Path(tmp_dir) / "shared_base.py"
+            base_file.write_text(
+                "from core.plugin_manager import BasePlugin\n"
+                "class SharedBase(BasePlugin):\n"
+                "    author = 'Shared'\n",
+                encoding="utf-8")
+            plugin_file = Path(tmp_dir) / "indirect_plugin.py"
+            plugin_file.write_text(
+                "from core.plugin_manager import BasePlugin\n"
+                "from PySide6.QtWidgets import QWidget\n"
+                "from .shared_base import SharedBase\n"
+                "class LocalBase(BasePlugin):\n"
+                "    version = '2.0'\n"
+                "class LocalPlugin(LocalBase):\n"
+                "    name = 'Local Plugin'\n"
+                "class ImportedPlugin(SharedBase):\n"
+                "    name = 'Imported Plugin'\n"
+                "class Panel(QWidget):\n"
+                "    name = 'Not a plugin'\n",
+                encoding="utf-8")
+
+            descriptors = {d.class_name: d for d in _scan_metadata(plugin_file)}
+            self.assertEqual(set(descriptors), {"LocalBase", "LocalPlugin", "ImportedPlugin"})
+            self.assertEqual(descriptors["LocalPlugin"].name, "Local Plugin")
+            self.assertEqual(descriptors["LocalPlugin"].version, "2.0")
+            self.assertEqual(descriptors["ImportedPlugin"].author, "Shared")
+
+    def test_plugin_discovery_async(self):
+        """🧵 Verificar que el descubrimiento en segundo plano registre los plugins en el hilo de la GUI"""
+        if not QT_AVAILABLE:
+            self.skipTest("PySide6 no disponible")
+        import time
+        results = []
+        self.plugin_manager.discovery_complete.connect(results.append)
+        self.assertTrue(self.plugin_manager.discover_plugins_async())
+
+        deadline = time.monotonic() + 10
+        while not results and time.monotonic() < deadline:
+            QApplication.processEvents()
+            time.sleep(0.01)
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(sorted(set(results[0])), sorted(self.plugin_manager.get_available_plugins()))
+
     def test_plugin_loading(self):
         """🔄 Verificar que se puedan cargar plugins"""
         print_step("Verificando carga de plugins...", Colors.CYAN)
@@ -807,7 +1018,156 @@ class TestThreadManager(unittest.TestCase):
             self.assertIn('total_failed', stats)
         except Exception as e:
             self.fail(f"Error al obtener estadísticas: {e}")
-    
+
+    def test_thread_sharding(self):
+        """🧵 Verificar que las tareas se reparten entre shards y se ven como un todo"""
+        import threading
+        release = threading.Event()
+        names = [f"task_{i}" for i in range(16)]
+
+        for name in names:
+            self.assertTrue(self.thread_manager.start_task(name, release.wait, 5))
+        self.assertFalse(self.thread_manager.start_task(names[0], release.wait, 5))
+
+        self.assertEqual(set(self.thread_manager.futures), set(names))
+        self.assertEqual(set(self.thread_manager.get_all_threads_status()), set(names))
+        self.assertEqual(self.thread_manager.get_statistics()['active_tasks'], len(names))
+        used = sum(1 for shard in self.thread_manager._shards if shard.futures)
+        self.assertGreater(used, 1, "Los nombres deberían repartirse en varios shards")
+        release.set()
+
+    def test_start_task_duplicate_race(self):
+        """🧵 Verificar que un mismo nombre de tarea solo se acepta una vez entre hilos"""
+        import threading
+        release = threading.Event()
+        barrier = threading.Barrier(8)
+        accepted = []
+
+        def submit():
+            barrier.wait()
+            accepted.append(self.thread_manager.start_task("shared", release.wait, 5))
+
+        submitters = [threading.Thread(target=submit) for _ in range(8)]
+        for thread in submitters:
+            thread.start()
+        for thread in submitters:
+            thread.join()
+
+        self.assertEqual(accepted.count(True), 1)
+        self.assertEqual(list(self.thread_manager.futures), ["shared"])
+        release.set()
+
+    def test_work_stealing_executor(self):
+        """🧵 Verificar que el executor con robo de trabajo ejecuta subtareas anidadas"""
+        from core.ws_executor import WorkStealingExecutor
+
+        executor = WorkStealingExecutor(max_workers=4)
+        try:
+            def fan_out(n):
+                subtasks = [executor.submit(pow, i, 2) for i in range(n)]
+                return sum(f.result() for f in subtasks)
+
+            outer = [executor.submit(fan_out, 10) for _ in range(3)]
+            self.assertEqual([f.result(timeout=5) for f in outer], [285] * 3)
+
+            failing = executor.submit(int, "x")
+            self.assertIsInstance(failing.exception(timeout=5), ValueError)
+        finally:
+            executor.shutdown(wait=True)
+
+        with self.assertRaises(RuntimeError):
+            executor.submit(int, "1")
+
+    def test_thread_pool_reuses_workers(self):
+        """🧵 Verificar que start_thread reutiliza un número fijo de hilos"""
+        from PySide6.QtWidgets import QApplication
+        from core.thread_manager import ThreadManager
+        import time
+
+        manager = ThreadManager(max_workers=2)
+        results = {}
+        manager.thread_finished.connect(lambda name, result: results.__setitem__(name, result))
+        try:
+            # Waves of max_workers jobs, each started once the pool is idle again
+            for wave in range(3):
+                for i in range(wave * 2, wave * 2 + 2):
+                    self.assertTrue(manager.start_thread(f"job_{i}", pow, i, 2))
+                self.assertLessEqual(len(manager._workers), 2)
+
+                deadline = time.time() + 5
+                while manager.active_threads and time.time() < deadline:
+                    QApplication.processEvents()
+                    time.sleep(0.01)
+
+            QApplication.processEvents()
+            self.assertEqual(results, {f"job_{i}": i * i for i in range(6)})
+            self.assertEqual(len(manager.active_threads), 0)
+        finally:
+            manager.shutdown_all_threads()
+
+    def test_busy_pool_starts_extra_worker(self):
+        """🧵 Verificar que un trabajo no espera indefinidamente si todo el pool está ocupado"""
+        from core.thread_manager import ThreadManager
+        import threading
+
+        manager = ThreadManager(max_workers=2)
+        release = threading.Event()
+        started = [threading.Event() for _ in range(3)]
+
+        def blocking_job(index):
+            started[index].set()
+            release.wait(5)
+
+        try:
+            for i in range(3):
+                self.assertTrue(manager.start_thread(f"blocking_{i}", blocking_job, i))
+                if i < 2:
+                    self.assertTrue(started[i].wait(5))
+            self.assertTrue(started[2].wait(5), "El trabajo extra nunca empezó")
+            self.assertEqual(len(manager._workers), 3)
+        finally:
+            release.set()
+            manager.shutdown_all_threads()
+
+    def test_idle_workers_retire(self):
+        """🧵 Verificar que los hilos inactivos del pool terminan solos"""
+        from PySide6.QtWidgets import QApplication
+        import core.thread_manager as thread_manager_module
+        import time
+
+        original_timeout = thread_manager_module._WORKER_IDLE_TIMEOUT_S
+        thread_manager_module._WORKER_IDLE_TIMEOUT_S = 0.05
+        manager = thread_manager_module.ThreadManager(max_workers=1)
+        try:
+            self.assertTrue(manager.start_thread("idle_probe", pow, 2, 2))
+            workers = tuple(manager._workers)
+            self.assertEqual(len(workers), 1)
+            self.assertTrue(workers[0].wait(5000))
+
+            deadline = time.time() + 5
+            while manager._workers and time.time() < deadline:
+                QApplication.processEvents()
+                time.sleep(0.01)
+            self.assertEqual(manager._workers, [])
+        finally:
+            thread_manager_module._WORKER_IDLE_TIMEOUT_S = original_timeout
+            manager.shutdown_all_threads()
+
+    def test_threads_changed_coalesced(self):
+        """🧵 Verificar que threads_changed se emite una sola vez por ráfaga"""
+        from PySide6.QtWidgets import QApplication
+        import threading
+        release = threading.Event()
+        emitted = []
+        self.thread_manager.threads_changed.connect(lambda: emitted.append(True))
+
+        for i in range(5):
+            self.thread_manager.start_task(f"burst_{i}", release.wait, 5)
+        self.assertEqual(emitted, [], "La señal no debería emitirse de forma síncrona")
+        QApplication.processEvents()
+        self.assertEqual(len(emitted), 1)
+        release.set()
+
     def tearDown(self):
         """Limpiar después de las pruebas"""
         try:
@@ -861,6 +1221,46 @@ class TestToolManager(unittest.TestCase):
         except Exception as e:
             self.fail(f"Error al obtener información de herramientas: {e}")
 
+    def test_tool_metadata_cache(self):
+        """🛠️ Verificar que los metadatos en caché evitan volver a analizar scripts"""
+        from core.tool_manager import ToolManager, ToolInfo
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            script = Path(temp_dir) / "demo_tool.py"
+            script.write_text('"""Demo tool for cache tests"""\n__version__ = "1.2"\n', encoding='utf-8')
+
+            ToolManager(temp_dir)
+            with patch.object(ToolInfo, '_parse_script_metadata') as parse:
+                cached_manager = ToolManager(temp_dir)
+                parse.assert_not_called()
+            tool = cached_manager.get_tool("demo_tool")
+            self.assertEqual(tool.version, "1.2")
+            self.assertEqual(tool.description, "Demo tool for cache tests")
+
+            script.write_text('__version__ = "2.0"\n', encoding='utf-8')
+            os.utime(script, ns=(0, 0))
+            cached_manager.refresh_tools()
+            self.assertEqual(cached_manager.get_tool("demo_tool").version, "2.0")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_tool_docstring_any_quotes(self):
+        """📜 Verificar que se leen docstrings con comillas simples y tras comentarios largos"""
+        from core.tool_manager import ToolInfo
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            plain = Path(temp_dir) / "plain_doc.py"
+            plain.write_text('"Plain quoted tool"\n', encoding='utf-8')
+            self.assertEqual(ToolInfo(str(plain)).description, "Plain quoted tool")
+
+            late = Path(temp_dir) / "late_doc.py"
+            late.write_text("# cabecera\n" * 600 + "'''Late docstring tool'''\n", encoding='utf-8')
+            self.assertEqual(ToolInfo(str(late)).description, "Late docstring tool")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
 class TestSpecificPlugins(unittest.TestCase):
     """Pruebas específicas de plugins individuales"""
     
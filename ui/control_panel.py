@@ -604,16 +604,8 @@ class ControlPanel(FloatingPanel):
             if plugin:
                 plugin_info = plugin.get_info()
             else:
-                # Create dummy info for unloaded plugins
-                plugin_class = self.plugin_manager.available_plugins[plugin_name]
-                plugin_info = {
-                    "name": plugin_class.name,
-                    "description": plugin_class.description,
-                    "version": plugin_class.version,
-                    "author": plugin_class.author,
-                    "is_active": False,
-                    "is_initialized": False
-                }
+                # Unloaded plugins are described by their discovery metadata
+                plugin_info = self.plugin_manager.available_plugins[plugin_name].get_info()
             
             item = PluginListItem(plugin_name, plugin_info)
             self.plugin_list.addItem(item)
@@ -658,8 +650,10 @@ class ControlPanel(FloatingPanel):
             if child:
                 child.setParent(None)
         
-        # Get plugin instance
+        # Get plugin instance, creating it on first use
         plugin = self.plugin_manager.get_plugin(plugin_name)
+        if plugin is None and self.plugin_manager.load_plugin(plugin_name):
+            plugin = self.plugin_manager.get_plugin(plugin_name)
         
         if plugin and hasattr(plugin, 'get_config_widget'):
             config_widget = plugin.get_config_widget()
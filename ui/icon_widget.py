@@ -5,6 +5,7 @@ A draggable floating icon that provides quick access to the control panel.
 
 import logging
 from pathlib import Path
+from typing import Callable, Optional
 from PySide6.QtWidgets import (QWidget, QLabel, QVBoxLayout, QGraphicsDropShadowEffect,
                               QSystemTrayIcon, QMenu, QApplication)
 from PySide6.QtCore import Qt, QPoint, QTimer, QPropertyAnimation, QEasingCurve, Signal, QRect, QObject, QSize
@@ -109,11 +110,12 @@ class FloatingIcon(QWidget):
     double_clicked = Signal()
     right_clicked = Signal()
     
-    def __init__(self, config_manager: ConfigManager, control_panel, parent=None):
+    def __init__(self, config_manager: ConfigManager, get_control_panel: Optional[Callable] = None, parent=None):
         super().__init__(parent)
         
         self.config_manager = config_manager
-        self.control_panel = control_panel
+        # Zero-arg callable so the control panel is only built when first clicked
+        self.get_control_panel = get_control_panel
         self.logger = logging.getLogger("FloatingIcon")
         
         # State variables
@@ -450,10 +452,11 @@ class FloatingIcon(QWidget):
     def _handle_click(self):
         """Handle icon click."""
         # Toggle control panel visibility
-        if hasattr(self.control_panel, 'isVisible'):
-            if self.control_panel.isVisible():
-                self.control_panel.hide()
+        control_panel = self.get_control_panel() if self.get_control_panel else None
+        if hasattr(control_panel, 'isVisible'):
+            if control_panel.isVisible():
+                control_panel.hide()
             else:
-                self.control_panel.show()
-                self.control_panel.raise_()
-                self.control_panel.activateWindow()
+                control_panel.show()
+                control_panel.raise_()
+                control_panel.activateWindow()
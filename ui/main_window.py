@@ -5,7 +5,7 @@ The main application window (usually hidden, accessible via floating icon).
 
 import logging
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, Slot
 from PySide6.QtGui import QIcon
 
 from core.config_manager import ConfigManager
@@ -30,6 +30,9 @@ class MainWindow(QMainWindow):
         self._setup_window()
         self._setup_ui()
         self._load_config()
+        
+        # Refresh plugin counts once per discovery pass
+        self.plugin_manager.plugins_discovered.connect(self._on_plugins_discovered)
     
     def _setup_window(self):
         """Setup main window properties."""
@@ -234,6 +237,12 @@ class MainWindow(QMainWindow):
             self.loaded_plugins_label.setText(f"Loaded plugins: {loaded_count}")
             self.available_plugins_label.setText(f"Available plugins: {available_count}")
     
+    @Slot(list)
+    def _on_plugins_discovered(self, plugin_names):
+        """Update statistics after a plugin discovery pass."""
+        if self.isVisible():
+            self.update_stats()
+    
     def showEvent(self, event):
         """Handle show event."""
         super().showEvent(event)